@@ -10,9 +10,10 @@ import subprocess
 import tempfile
 from abc import ABC, abstractmethod
 from typing import Optional, Dict, Any, List, Callable
-from datetime import datetime
 from utils.cli_logger import log_cli_call
 from utils.secrets import load_project_secrets
+from utils.clock import now_iso
+from utils.text import sanitize_output
 
 
 class BaseAgent(ABC):
@@ -71,7 +72,7 @@ class BaseAgent(ABC):
     def log_activity(self, action: str, details: str = ""):
         """Log agent activity for the activity feed."""
         activity = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso(),
             "agent": self.name,
             "role": self.role,
             "action": action,
@@ -535,10 +536,10 @@ class BaseAgent(ABC):
                 if error_output.strip():
                     output += f"\n\nStderr:\n{error_output}"
 
-            # Fire debug callback with full output (non-blocking)
+            # Hand full output to the debug callback (it only queues, never blocks)
             if self.stream_callback and output:
                 try:
-                    asyncio.create_task(self.stream_callback(self.name, output))
+                    self.stream_callback(self.name, output)
                 except Exception:
                     pass
         except asyncio.CancelledError:
@@ -630,23 +631,7 @@ class BaseAgent(ABC):
 
     def _sanitize_output(self, text: str) -> str:
         """Remove or replace characters that might cause encoding issues."""
-        if not text:
-            return text
-        # Replace common problematic Unicode characters with ASCII equivalents
-        replacements = {
-            '\u2018': "'",  # Left single quote
-            '\u2019': "'",  # Right single quote
-            '\u201c': '"',  # Left double quote
-            '\u201d': '"',  # Right double quote
-            '\u2013': '-',  # En dash
-            '\u2014': '--', # Em dash
-            '\u2026': '...', # Ellipsis
-            '\u00a0': ' ',  # Non-breaking space
-        }
-        for char, replacement in replacements.items():
-            text = text.replace(char, replacement)
-        # Remove any remaining non-ASCII characters that might cause issues
-        return text.encode('ascii', errors='replace').decode('ascii')
+        return sanitize_output(text)
 
     async def ask_question(
         self,
@@ -7,7 +7,18 @@ import json
 from typing import Dict, Any, Optional, Callable, List
 from datetime import datetime
 from utils.cli_logger import log_cli_call
+from utils.clock import now_iso
 from utils.secrets import load_project_secrets
+from utils.text import sanitize_output
+
+
+def _read_text_if_exists(path: str) -> str:
+    """Return a UTF-8 file's contents, or "" if it does not exist."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except FileNotFoundError:
+        return ""
 
 
 class ConversationManager:
@@ -90,7 +101,7 @@ class ConversationManager:
         """Log activity."""
         if self.activity_callback:
             self.activity_callback({
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now_iso(),
                 "agent": "project_manager",
                 "action": action,
                 "details": details
@@ -103,7 +114,7 @@ class ConversationManager:
                 "type": msg_type,
                 "agent": agent,
                 "message": message,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": now_iso()
             })
 
     async def send_thinking(self, agent: str):
@@ -185,11 +196,9 @@ Question #{self.question_count + 1}: Ask your first question about the project."
         self._max_questions = num_questions
 
         # Load existing spec and store for progressive trimming
+        # (off the event loop: SPEC.md of a mature project can be large)
         spec_path = os.path.join(self.project_path, "SPEC.md")
-        existing_spec = ""
-        if os.path.exists(spec_path):
-            with open(spec_path, 'r', encoding='utf-8') as f:
-                existing_spec = f.read()
+        existing_spec = await asyncio.to_thread(_read_text_if_exists, spec_path)
 
         # Store full spec for first few questions, trim later
         self._full_spec_context = existing_spec[:2000]
@@ -493,17 +502,7 @@ Question #{self.question_count + 1}: Ask your first question about this feature.
 
     def _sanitize_output(self, text: str) -> str:
         """Remove or replace characters that might cause encoding issues."""
-        if not text:
-            return text
-        replacements = {
-            '\u2018': "'", '\u2019': "'",
-            '\u201c': '"', '\u201d': '"',
-            '\u2013': '-', '\u2014': '--',
-            '\u2026': '...', '\u00a0': ' ',
-        }
-        for char, replacement in replacements.items():
-            text = text.replace(char, replacement)
-        return text.encode('ascii', errors='replace').decode('ascii')
+        return sanitize_output(text)
 
     def _build_pm_env(self) -> Dict[str, str]:
         """Build environment variables for PM subprocess calls."""
@@ -723,21 +722,11 @@ Question #{self.question_count + 1}: Ask your first question about this feature.
         todo_path = os.path.join(self.project_path, "TODO.md")
         summary_path = os.path.join(self.project_path, "SUMMARY.md")
 
-        spec_content = ""
-        todo_content = ""
-        summary_content = ""
-
-        if os.path.exists(spec_path):
-            with open(spec_path, 'r', encoding='utf-8') as f:
-                spec_content = f.read()
-
-        if os.path.exists(todo_path):
-            with open(todo_path, 'r', encoding='utf-8') as f:
-                todo_content = f.read()
-
-        if os.path.exists(summary_path):
-            with open(summary_path, 'r', encoding='utf-8') as f:
-                summary_content = f.read()
+        spec_content, todo_content, summary_content = await asyncio.gather(
+            asyncio.to_thread(_read_text_if_exists, spec_path),
+            asyncio.to_thread(_read_text_if_exists, todo_path),
+            asyncio.to_thread(_read_text_if_exists, summary_path),
+        )
 
         # Store full context for progressive trimming (spec + todo + summary)
         uat_context_parts = [
@@ -923,7 +912,7 @@ Question #{self.question_count + 1}: Start by briefly summarizing what was built
                     "type": "uat_complete",
                     "approved": True,
                     "message": "User approved the project",
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": now_iso()
                 })
 
             self.is_active = False
@@ -1025,7 +1014,7 @@ Make the updates now."""
                     "type": "uat_complete",
                     "approved": False,
                     "message": "Changes requested - returning to WIP",
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": now_iso()
                 })
 
         except asyncio.TimeoutError:
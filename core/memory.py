@@ -4,7 +4,7 @@ import os
 import re
 import json
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 
 class MemoryManager:
@@ -19,6 +19,9 @@ class MemoryManager:
         self.project_path = project_path
         self.memory_file = os.path.join(project_path, "MEMORY.md")
         self._file_cache: Dict[str, Dict[str, Any]] = {}
+        # Built contexts per section, valid while MEMORY.md/TODO.md are unchanged
+        self._context_cache: Dict[Optional[str], str] = {}
+        self._context_cache_sources: Tuple[Optional[str], Optional[str]] = (None, None)
         memory_config = (config or {}).get('memory', {})
         self.max_action_log_entries = memory_config.get('max_action_log_entries', 15)
         self._ensure_memory_file()
@@ -128,24 +131,55 @@ class MemoryManager:
             task: The task text
             section: Optional section name to filter TODO tasks (e.g., "## Setup")
         """
-        context_parts = []
+        return self.get_contexts_for_tasks([(task, section)])[0]
 
-        # Include recent decisions (last 2) — minimal but high-value for architectural guidance
-        decisions = self._get_recent_decisions(2)
-        if decisions:
-            context_parts.append("Recent decisions:\n" + "\n".join(decisions))
+    def get_contexts_for_tasks(self, tasks: List[Tuple[str, Optional[str]]]) -> List[str]:
+        """
+        Batch form of get_context_for_task for tasks scheduled together.
+
+        Recent decisions and TODO.md are read once per batch and each distinct
+        section is filtered once, instead of repeating that work per task.
 
-        # Include a few sibling tasks from the same section for awareness (max 3).
-        # Skip if no section specified — the agent doesn't need random unrelated tasks.
-        if section:
+        Args:
+            tasks: (task text, optional section) pairs
+        """
+        memory_content = self._read_file_cached(self.memory_file)
+        todo_content = None
+        needs_todo = any(section for _, section in tasks)
+        if needs_todo:
             todo_path = os.path.join(self.project_path, "TODO.md")
             todo_content = self._read_file_cached(todo_path)
-            if todo_content is not None:
-                filtered_todo = self._filter_todo_for_section(todo_content, section)
-                if filtered_todo:
-                    context_parts.append(f"Other tasks in this section:\n{filtered_todo}")
 
-        return "\n\n".join(context_parts) if context_parts else ""
+        # The context depends only on the section and the two files, so built
+        # contexts are kept until _read_file_cached hands back new content
+        # (e.g. after record_action rewrites MEMORY.md)
+        sources = self._context_cache_sources
+        if sources[0] is not memory_content or (needs_todo and sources[1] is not todo_content):
+            self._context_cache = {}
+            self._context_cache_sources = (memory_content, todo_content)
+        by_section = self._context_cache
+
+        decisions_part = None
+        contexts = []
+        for _, section in tasks:
+            if section not in by_section:
+                if decisions_part is None:
+                    # Include recent decisions (last 2) — minimal but high-value for architectural guidance
+                    decisions = self._get_recent_decisions(2)
+                    decisions_part = "Recent decisions:\n" + "\n".join(decisions) if decisions else ""
+                context_parts = [decisions_part] if decisions_part else []
+
+                # Include a few sibling tasks from the same section for awareness (max 3).
+                # Skip if no section specified — the agent doesn't need random unrelated tasks.
+                if section and todo_content is not None:
+                    filtered_todo = self._filter_todo_for_section(todo_content, section)
+                    if filtered_todo:
+                        context_parts.append(f"Other tasks in this section:\n{filtered_todo}")
+
+                by_section[section] = "\n\n".join(context_parts) if context_parts else ""
+            contexts.append(by_section[section])
+
+        return contexts
 
     # Pattern to strip {ID} prefix and [depends: ...] suffix from task lines
     _TASK_METADATA_RE = re.compile(
@@ -3,9 +3,15 @@
 import os
 import re
 import json
+import hashlib
+import time
 import asyncio
-import aiofiles
-from typing import Dict, Any, List, Optional, Callable, Set
+import itertools
+import random
+import contextlib
+from collections import deque
+from typing import Deque, Dict, Any, List, Optional, Callable, Set, Tuple, Iterator, Union
+from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 
@@ -21,6 +27,163 @@ from agents import (
 from .memory import MemoryManager
 from .project import ProjectManager, ProjectStatus
 from .playwright_utils import PlaywrightManager
+from utils.clock import fmt_ts, now_iso
+from utils.text import to_ascii
+
+# File types considered "code" for security review and change detection
+_CODE_EXTENSIONS = frozenset({'.py', '.js', '.ts', '.jsx', '.tsx', '.html', '.css', '.sql', '.sh', '.yml', '.yaml', '.json'})
+# Same set as a tuple for a single str.endswith() check per file name
+_CODE_SUFFIXES = tuple(sorted(_CODE_EXTENSIONS))
+# Directories never scanned for code, tests, or language detection
+_EXCLUDE_DIRS = frozenset({'.git', 'node_modules', '__pycache__', '.venv', 'venv', 'dist', 'build', 'QA'})
+# Files the workflow itself rewrites; they must not count as code changes
+_BOOKKEEPING_FILES = frozenset({'STATUS.json', '.quality_gate.json'})
+
+# Normalized testing strategies (see Orchestrator._normalize_testing_strategy)
+_SMOKE_STRATEGIES = frozenset({"smoke", "smoke_tests", "smoke_test"})
+# Strategies that skip the dedicated testing phase
+_SKIP_STRATEGIES = _SMOKE_STRATEGIES | {"minimal"}
+# Strategies whose test runs are skipped when code hasn't changed
+_TDD_STRATEGIES = frozenset({"critical_paths", "full_tdd"})
+
+# Phrases marking a task as obviously small / large for complexity estimation
+_SMALL_TASK_INDICATORS = ('fix typo', 'update text', 'change color', 'rename', 'add comment', 'remove unused')
+_LARGE_TASK_INDICATORS = (
+    'implement', 'create full', 'build complete', 'design and implement',
+    'refactor entire', 'migrate', 'integrate', 'authentication system',
+    'database schema', 'api endpoints', 'full crud'
+)
+# Phrases that keep a task out of same-section batching
+_UNBATCHABLE_TASK_INDICATORS = (
+    'refactor', 'migrate', 'architecture',
+    'authentication', 'authorization', 'database schema', 'full crud',
+    'design and implement', 'build complete'
+)
+
+# Keyword routing for _determine_agent_for_task, checked in order. Narrow,
+# high-confidence phrases come first; broad words like 'test', 'ui' and
+# 'model' match too many tasks, so they are only tried as late fallbacks.
+_AGENT_KEYWORD_RULES = (
+    # QA tester: only explicit QA, verification, and regression work
+    ("qa_tester", ('qa review', 'qa test', 'regression test', 'verify requirements',
+                   'acceptance test', 'end-to-end test', 'e2e test')),
+    # Security reviewer: only audits/reviews, not implementation of auth features
+    ("security_reviewer", ('security audit', 'security review', 'vulnerability',
+                           'penetration test', 'security scan')),
+    # Testing agent: writing or running tests (unit, integration, etc.)
+    ("testing_agent", ('write test', 'create test', 'add test', 'update test', 'unit test',
+                       'integration test', 'test suite', 'test case', 'run test', 'fix test')),
+    ("ui_ux_engineer", ('css', 'style', 'layout', 'frontend', 'html', 'template',
+                        'responsive', 'navbar', 'sidebar', 'modal', 'theme')),
+    # Specific DB terms, not broad words like 'model'
+    ("database_admin", ('database', 'schema', 'sql', 'migration', 'table', 'query',
+                        'index', 'foreign key', 'seed data')),
+    # 'test' alone (not caught above) -> testing_agent, not qa_tester
+    ("testing_agent", ('test',)),
+    ("ui_ux_engineer", ('ui', 'ux', 'design', 'interface')),
+    ("database_admin", ('db', 'model')),
+)
+
+# Build/config files in the project root that identify its languages
+_LANGUAGE_MARKER_FILES = (
+    ("python", frozenset({"pyproject.toml", "requirements.txt", "setup.py", "setup.cfg"})),
+    ("node", frozenset({"package.json"})),
+    ("go", frozenset({"go.mod"})),
+    ("rust", frozenset({"Cargo.toml"})),
+    ("java", frozenset({"pom.xml", "build.gradle", "build.gradle.kts"})),
+    ("ruby", frozenset({"Gemfile"})),
+    ("php", frozenset({"composer.json"})),
+)
+
+_ERROR_LOG_HEADER = "# Error Log\n\nThis file contains errors encountered during project execution for analysis and improvement.\n\n"
+
+# Message sent to the UI when a failed task needs a decision from the user
+_ESCALATION_TEMPLATE = """A task has failed and needs your input.
+
+**Failed Task:** {task}
+
+**Error:** {error}
+
+**What would you like to do?**
+1. **retry** - Try the task again
+2. **skip** - Skip this task and continue with others
+3. **modify** - Let me suggest a simpler version of this task
+4. **remove** - Remove this task from TODO.md
+5. **stop** - Stop all work
+
+Please reply with one of: retry, skip, modify, remove, or stop"""
+
+# Heuristic task splitting: separators tried in order, list-marker prefix, cap
+_SUBTASK_SEPARATORS = ("\n", ";", " and then ", " then ", ". ")
+_SUBTASK_PREFIX_RE = re.compile(r'^(?:[-*]|\d+[.)])\s+')
+_MAX_SUBTASKS = 4
+
+# Bytes of each test-runner stream kept for the test summary
+_TEST_OUTPUT_CAP = 64 * 1024
+
+
+async def _wait_event(event: asyncio.Event, timeout: float):
+    """Wait for an event, raising asyncio.TimeoutError after timeout seconds.
+
+    Uses asyncio.timeout() (3.11+) so no wrapper task is spawned; falls back
+    to wait_for on 3.10. Both run on the loop's monotonic clock.
+    """
+    if hasattr(asyncio, "timeout"):
+        async with asyncio.timeout(timeout):
+            await event.wait()
+    else:
+        await asyncio.wait_for(event.wait(), timeout=timeout)
+
+
+async def _iter_completed(tasks: List[asyncio.Task]):
+    """Yield tasks in completion order.
+
+    Unlike asyncio.as_completed, the finished Task itself is yielded, so a
+    task cancelled by force_stop can be told apart from the caller being
+    cancelled.
+    """
+    pending = set(tasks)
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            yield task
+
+
+async def _read_capped(reader: asyncio.StreamReader, cap: int = _TEST_OUTPUT_CAP) -> bytes:
+    """Read a subprocess stream to EOF, keeping only its first cap bytes.
+
+    The rest is still read and dropped so the child never blocks on a full pipe.
+    """
+    kept = bytearray()
+    while True:
+        chunk = await reader.read(65536)
+        if not chunk:
+            return bytes(kept)
+        if len(kept) < cap:
+            kept += chunk[:cap - len(kept)]
+
+
+def _read_text(path: str) -> str:
+    """Read a whole UTF-8 file (run via asyncio.to_thread: one thread hop per read)."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def _append_text(path: str, data: str, header: str = ""):
+    """Append to a UTF-8 file in O_APPEND mode, writing header first if the file is empty.
+
+    Avoids a separate exists() check (and its race) before choosing a mode.
+    """
+    with open(path, 'a', encoding='utf-8') as f:
+        if header and f.tell() == 0:
+            f.write(header)
+        f.write(data)
+
+
+def _write_text(path: str, data: str, mode: str = 'w'):
+    """Write/append a whole UTF-8 string (run via asyncio.to_thread: one thread hop per write)."""
+    with open(path, mode, encoding='utf-8') as f:
+        f.write(data)
 
 
 class TaskFailureAction(Enum):
@@ -32,6 +195,40 @@ class TaskFailureAction(Enum):
     STOP_WORK = "stop"
 
 
+@dataclass(slots=True)
+class Activity:
+    """A single activity-feed entry, stored compactly and emitted as a dict.
+
+    timestamp may be a time.time_ns() int and details a zero-argument
+    callable; both are formatted only when the entry is emitted.
+    """
+    timestamp: Any
+    agent: str
+    action: str
+    details: Any = ""
+    role: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Activity":
+        return cls(
+            timestamp=data.get("timestamp"),
+            agent=data.get("agent", ""),
+            action=data.get("action", ""),
+            details=data.get("details", ""),
+            role=data.get("role")
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        timestamp = self.timestamp
+        if isinstance(timestamp, int):
+            timestamp = fmt_ts(timestamp)
+        details = self.details() if callable(self.details) else self.details
+        data = {"timestamp": timestamp, "agent": self.agent, "action": self.action, "details": details}
+        if self.role is not None:
+            data["role"] = self.role
+        return data
+
+
 class Orchestrator:
     """
     The Orchestrator coordinates all agents and manages the flow of work.
@@ -58,7 +255,11 @@ class Orchestrator:
         self.activity_callback = activity_callback
         self.human_input_callback = human_input_callback
         self.message_callback = message_callback  # For sending work status updates
-        self.activity_log: List[Dict[str, Any]] = []
+        # Bounded so long-running sessions don't grow the log without limit;
+        # 0 disables the cap (deque(maxlen=0) would keep nothing)
+        self.activity_log: Deque[Activity] = deque(
+            maxlen=config.get('execution', {}).get('activity_log_max_entries', 10_000) or None
+        )
         self.memory = MemoryManager(project_path, config=config)
 
         # Project status management
@@ -75,11 +276,44 @@ class Orchestrator:
         self.human_input_event = asyncio.Event()
         self.todo_lock = asyncio.Lock()
 
+        # In-memory TODO.md; edits mark it dirty and are flushed after a short debounce
+        self._todo_path = os.path.join(project_path, "TODO.md")
+        self._todo_lines: Optional[List[str]] = None
+        # (st_mtime_ns, st_size) of TODO.md when the lines were read or written
+        self._todo_stat: Optional[Tuple[int, int]] = None
+        self._todo_dirty = False
+        # Unflushed edits, replayed onto TODO.md if it changes underneath them
+        self._todo_pending_edits: List[Callable[[List[str]], bool]] = []
+        self._todo_flush_task: Optional[asyncio.Task] = None
+        # Raw task text -> line index from the last parse; a hint, checked before use
+        self._todo_line_index: Dict[str, int] = {}
+        # Bumped whenever the cached lines change (reload or edit); parsed
+        # tasks are reused while it stays the same
+        self._todo_version = 0
+        self._parsed_todo: Optional[Tuple[int, List[Dict[str, Any]]]] = None
+        # (version, ready tasks, section -> completed fraction) derived from it
+        self._todo_schedule_cache: Optional[Tuple[int, List[Dict[str, Any]], Dict[str, float]]] = None
+        # Outbound UI messages, delivered by an on-demand consumer task
+        self._msg_queue: Deque[Dict[str, Any]] = deque()
+        self._msg_consumer_task: Optional[asyncio.Task] = None
+
+        # (st_mtime_ns, content) of the last SPEC.md read
+        self._spec_cache: Optional[Tuple[int, str]] = None
+
+        # error_log.md entries are buffered and appended in batches
+        self._error_log_path = os.path.join(project_path, "error_log.md")
+        self._error_log_buffer: List[str] = []
+        self._error_log_lock = asyncio.Lock()
+        self._error_log_flush_task: Optional[asyncio.Task] = None
+
         # Work state
         self.is_working = False
         self.pause_requested = False
         self.total_failures = 0  # Track total failures for critical error detection
-        self.active_tasks = set()
+        # Running task coroutines; each removes itself when done. A strong set
+        # (not a WeakSet) so the event loop's weak references alone never
+        # decide a running task's lifetime
+        self.active_tasks: Set[asyncio.Task] = set()
         self.work_task: Optional[asyncio.Task] = None
 
         # User escalation state
@@ -93,14 +327,30 @@ class Orchestrator:
         self.task_timeout = exec_config.get('task_timeout_seconds', 600)
         self.simple_task_timeout = exec_config.get('simple_task_timeout_seconds', 300)
         self.max_task_retries = exec_config.get('max_task_retries', 3)
+        self.retry_backoff_initial = exec_config.get('retry_backoff_initial_seconds', 1.0)
+        self.retry_backoff_max = exec_config.get('retry_backoff_max_seconds', 15.0)
         self.allow_cross_section_parallel = exec_config.get('allow_cross_section_parallel', True)
         self.enable_task_batching = exec_config.get('enable_task_batching', True)
         self.task_batch_size = exec_config.get('task_batch_size', 2)
-        self.semaphore = asyncio.Semaphore(self.max_concurrent)
+        self.session_continuity = exec_config.get('session_continuity', False)
+        # Agent-run admission: an in-flight count under a Condition rather than
+        # a Semaphore, so the limit can be changed while runs are in flight
+        self._in_flight = 0
+        self._slot_cond = asyncio.Condition()
         default_strategy = config.get("defaults", {}).get("testing_strategy", "critical_paths")
         project_strategy = self.project_manager_core.get_testing_strategy(self.project_name)
         self.testing_strategy = project_strategy or default_strategy
+        self._testing_strategy_norm = self._normalize_testing_strategy()
         self.last_test_result: Optional[Dict[str, Any]] = None
+        # Snapshot of the code tree at the last successful security review
+        self._last_review_mtime: Optional[int] = None
+        self._last_review_file_count = 0
+        # Code-file walk: directory -> (mtime, subdirectories, code files)
+        self._scan_cache: Dict[str, Tuple[int, List[str], List[str]]] = {}
+        # (latest code mtime, pytest files found) from the last _detect_pytests
+        self._tests_detected_cache: Optional[Tuple[float, bool]] = None
+        # Completed security reviews keyed by the (path, sha256) set reviewed
+        self._security_review_cache: Dict[frozenset, Dict[str, Any]] = {}
         default_gates = config.get("quality_gates", {})
         project_gates = self.project_manager_core.get_quality_gates(self.project_name)
         merged_gates = default_gates.copy()
@@ -145,6 +395,16 @@ class Orchestrator:
                 playwright_available=self.playwright_available
             )
         }
+        # Per-agent FIFO queue for runs that resume the agent's CLI session
+        self._agent_locks: Dict[str, asyncio.Lock] = {name: asyncio.Lock() for name in self.agents}
+        # Per-model run limits, shared by every agent configured with that
+        # model, on top of the global max_concurrent_agents slot count
+        model_limits = self.config.get('execution', {}).get(
+            'per_model_concurrency', {'opus': 2, 'auto': 5})
+        self._model_slots: Dict[str, asyncio.Semaphore] = {
+            model: asyncio.Semaphore(max(1, int(limit)))
+            for model, limit in (model_limits or {}).items()
+        }
 
         # Wire debug streaming if enabled
         debug_enabled = self.config.get('debug', {}).get('enabled', False)
@@ -153,14 +413,18 @@ class Orchestrator:
                 agent.stream_callback = self._make_stream_callback(agent_name)
 
     def _make_stream_callback(self, agent_name: str):
-        """Create a stream callback for debug mode that broadcasts lines via WebSocket."""
-        async def stream_cb(name: str, line: str):
+        """Create a stream callback for debug mode that queues output for the UI.
+
+        Output goes through the same queue as other UI messages, so output
+        from agents finishing together reaches the browser in one frame.
+        """
+        def stream_cb(name: str, line: str):
             if self.message_callback:
-                await self.message_callback({
+                self._enqueue_message({
                     "type": "debug_output",
                     "agent": name,
                     "line": line,
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": time.time_ns()
                 })
         return stream_cb
 
@@ -172,17 +436,31 @@ class Orchestrator:
             else:
                 agent.stream_callback = None
 
-    def _log_activity(self, activity: Dict[str, Any]):
-        """Log an activity and notify listeners."""
+    def _log_activity(self, activity: Union[Activity, Dict[str, Any]]):
+        """Log an activity and notify listeners.
+
+        Accepts an Activity or a plain dict (agents still pass dicts). Entries
+        are stored as slotted Activity records and only turned into dicts,
+        with lazy timestamps/details formatted, when read back or when the
+        activity_callback (which receives the Activity itself) emits them.
+        """
+        if not isinstance(activity, Activity):
+            activity = Activity.from_dict(activity)
         self.activity_log.append(activity)
         if self.activity_callback:
             self.activity_callback(activity)
 
-    async def _log_error(self, error_type: str, task: str, error_details: str, agent: str = "unknown"):
-        """Log an error to error_log.md for later analysis."""
-        error_log_path = os.path.join(self.project_path, "error_log.md")
+    def _log_event(self, action: str, details: Any = ""):
+        """Log an orchestrator activity (details may be a lazy zero-argument callable)."""
+        self._log_activity(Activity(time.time_ns(), "orchestrator", action, details))
 
-        timestamp = datetime.now().isoformat()
+    # Buffered error entries are flushed after this delay or once this many pile up
+    _ERROR_LOG_FLUSH_DELAY = 0.5
+    _ERROR_LOG_BATCH_SIZE = 64
+
+    async def _log_error(self, error_type: str, task: str, error_details: str, agent: str = "unknown"):
+        """Queue an error for error_log.md (written in batches) for later analysis."""
+        timestamp = now_iso()
         error_entry = f"""
 ## Error: {error_type}
 - **Timestamp:** {timestamp}
@@ -191,51 +469,50 @@ class Orchestrator:
 - **Details:** {error_details[:500]}
 ---
 """
+        self._error_log_buffer.append(error_entry)
 
-        try:
-            # Append to error log (create if doesn't exist)
-            if os.path.exists(error_log_path):
-                async with aiofiles.open(error_log_path, 'a', encoding='utf-8') as f:
-                    await f.write(error_entry)
-            else:
-                async with aiofiles.open(error_log_path, 'w', encoding='utf-8') as f:
-                    await f.write("# Error Log\n\nThis file contains errors encountered during project execution for analysis and improvement.\n\n")
-                    await f.write(error_entry)
-        except Exception as e:
-            # Don't fail if we can't write the error log
-            self._log_activity({
-                "timestamp": timestamp,
-                "agent": "orchestrator",
-                "action": "Failed to write error log",
-                "details": str(e)[:100]
-            })
+        if len(self._error_log_buffer) >= self._ERROR_LOG_BATCH_SIZE:
+            await self.flush_logs()
+        elif self._error_log_flush_task is None or self._error_log_flush_task.done():
+            self._error_log_flush_task = asyncio.create_task(self._debounced_error_log_flush())
 
-    async def _escalate_to_user(self, task: str, error: str, agent: str) -> TaskFailureAction:
-        """Escalate a task failure to the user for decision."""
-        self._log_activity({
-            "timestamp": datetime.now().isoformat(),
-            "agent": "orchestrator",
-            "action": "Escalating to user",
-            "details": f"Task failed: {task[:50]}..."
-        })
+    async def _debounced_error_log_flush(self):
+        """Coalesce bursts of errors into a single append."""
+        await asyncio.sleep(self._ERROR_LOG_FLUSH_DELAY)
+        await self.flush_logs()
 
-        # Send message asking user what to do
-        escalation_message = f"""A task has failed and needs your input.
+    async def flush_logs(self):
+        """Append all buffered error entries to error_log.md now.
 
-**Failed Task:** {task[:100]}{'...' if len(task) > 100 else ''}
+        Entries logged while a write is in progress are written by the next
+        pass of the loop, since no new flush is scheduled for them. If a write
+        fails, its entries go back to the front of the buffer for the next flush.
+        """
+        async with self._error_log_lock:
+            while self._error_log_buffer:
+                batch = self._error_log_buffer[:]
+                self._error_log_buffer.clear()
 
-**Error:** {error[:200]}{'...' if len(error) > 200 else ''}
+                try:
+                    # Append to error log (header written once, when the file is new/empty)
+                    await asyncio.to_thread(_append_text, self._error_log_path, "".join(batch), _ERROR_LOG_HEADER)
+                except Exception as e:
+                    # Don't fail if we can't write the error log
+                    self._error_log_buffer[:0] = batch
+                    self._log_event("Failed to write error log", str(e)[:100])
+                    return
 
-**What would you like to do?**
-1. **retry** - Try the task again
-2. **skip** - Skip this task and continue with others
-3. **modify** - Let me suggest a simpler version of this task
-4. **remove** - Remove this task from TODO.md
-5. **stop** - Stop all work
+    async def _escalate_to_user(self, task: str, error: str, agent: str) -> TaskFailureAction:
+        """Escalate a task failure to the user for decision."""
+        self._log_event("Escalating to user", f"Task failed: {task[:50]}...")
 
-Please reply with one of: retry, skip, modify, remove, or stop"""
+        # Send message asking user what to do
+        escalation_message = _ESCALATION_TEMPLATE.format_map({
+            "task": task[:100] + ('...' if len(task) > 100 else ''),
+            "error": error[:200] + ('...' if len(error) > 200 else ''),
+        })
 
-        await self._send_message(
+        self._send_message(
             "user_escalation",
             escalation_message,
             task=task,
@@ -249,15 +526,13 @@ Please reply with one of: retry, skip, modify, remove, or stop"""
 
         try:
             # Wait up to 5 minutes for user response, then default to skip
-            await asyncio.wait_for(self.user_decision_event.wait(), timeout=300)
+            await _wait_event(self.user_decision_event, 300)
             response = self.user_decision_response
         except asyncio.TimeoutError:
-            self._log_activity({
-                "timestamp": datetime.now().isoformat(),
-                "agent": "orchestrator",
-                "action": "Escalation timeout",
-                "details": "No user response after 5 minutes, defaulting to skip"
-            })
+            self._log_event(
+                "Escalation timeout",
+                "No user response after 5 minutes, defaulting to skip"
+            )
             response = "skip"
 
         self.pending_user_decision = None
@@ -276,105 +551,231 @@ Please reply with one of: retry, skip, modify, remove, or stop"""
         else:
             return TaskFailureAction.SKIP
 
+    async def _escalate_failures(self, failures: Deque[Tuple[Dict, str, str]], skipped_tasks: Set[str]):
+        """
+        Escalate failed tasks to the user one at a time and apply each decision.
+
+        Runs until failures is empty; the completion loop in start_work may
+        append to it meanwhile. A STOP_WORK decision stops work and drops the
+        failures still queued.
+        """
+        while failures:
+            task, error_msg, agent = failures.popleft()
+            action = await self._escalate_to_user(task=task["text"], error=error_msg, agent=agent)
+
+            if action == TaskFailureAction.RETRY:
+                # Don't add to skipped, will retry on next loop
+                self._log_event("Retrying task", task["text"][:100])
+            elif action == TaskFailureAction.SKIP:
+                skipped_tasks.add(task["text"])
+                self._send_message("info", f"Skipped: {task['text'][:50]}...")
+            elif action == TaskFailureAction.MODIFY_TASK:
+                # Get a simpler version of the task
+                new_task = self._suggest_simpler_task(task["text"], error_msg)
+                await self._modify_task_in_todo(task["text"], new_task)
+                self._send_message("info", f"Task modified to: {new_task[:50]}...")
+            elif action == TaskFailureAction.REMOVE_TASK:
+                await self._remove_task_from_todo(task["text"])
+                self._send_message("info", f"Removed task: {task['text'][:50]}...")
+            elif action == TaskFailureAction.STOP_WORK:
+                self._send_message("work_paused", "Work stopped by user request")
+                self.is_working = False
+                failures.clear()
+
     def receive_user_decision(self, decision: str):
         """Receive a decision from the user for a pending escalation."""
         if self.pending_user_decision:
             self.user_decision_response = decision
             self.user_decision_event.set()
 
-    async def _modify_task_in_todo(self, old_task: str, new_task: str):
-        """Modify a task in TODO.md."""
-        todo_path = os.path.join(self.project_path, "TODO.md")
-        if not os.path.exists(todo_path):
-            return
+    # Debounce window for coalescing TODO.md writes
+    _TODO_FLUSH_DELAY = 0.25
 
+    def _load_todo(self) -> Optional[List[str]]:
+        """Return TODO.md as a list of lines, re-reading only when its mtime or size changed.
+
+        Edits splice this list in place. If the file was changed by someone
+        else (e.g. an agent adding tasks) while edits are pending, it is
+        re-read and the pending edits are applied again on top of it.
+        """
+        try:
+            st = os.stat(self._todo_path)
+        except OSError:
+            if self._todo_dirty:
+                # The next flush recreates the file with the pending edits
+                return self._todo_lines
+            if self._todo_lines is not None:
+                self._todo_version += 1
+            self._todo_lines = None
+            self._todo_stat = None
+            return None
+        stat_key = (st.st_mtime_ns, st.st_size)
+        if self._todo_lines is None or stat_key != self._todo_stat:
+            lines = _read_text(self._todo_path).split('\n')
+            for edit in self._todo_pending_edits:
+                edit(lines)
+            self._todo_lines = lines
+            self._todo_stat = stat_key
+            self._todo_version += 1
+        return self._todo_lines
+
+    async def _edit_todo(self, edit: Callable[[List[str]], bool]) -> Optional[bool]:
+        """Apply edit to the cached TODO lines and schedule a debounced flush.
+
+        edit changes the lines in place and returns whether it found its
+        target. It is kept until the flush so it can be replayed if TODO.md
+        changes on disk first. Returns None when there is no TODO.md.
+        """
         async with self.todo_lock:
-            async with aiofiles.open(todo_path, 'r', encoding='utf-8') as f:
-                content = await f.read()
+            # A changed file is read (and pending edits replayed) off the loop
+            lines = await asyncio.to_thread(self._load_todo)
+            if lines is None:
+                return None
+            if not edit(lines):
+                return False
+            self._todo_pending_edits.append(edit)
+            self._todo_dirty = True
+            self._todo_version += 1
+        if self._todo_flush_task is None or self._todo_flush_task.done():
+            self._todo_flush_task = asyncio.create_task(self._debounced_todo_flush())
+        return True
 
-            old_line = f"- [ ] {old_task}"
-            new_line = f"- [ ] {new_task}"
-            content = content.replace(old_line, new_line)
+    @staticmethod
+    def _find_open_task_line(lines: List[str], task_text: str, fuzzy: bool = False,
+                             hint: Optional[int] = None) -> Optional[int]:
+        """Index of the unchecked line for task_text, or None.
 
-            async with aiofiles.open(todo_path, 'w', encoding='utf-8') as f:
-                await f.write(content)
+        An exact "- [ ] {task_text}" line wins. With fuzzy=True, fall back to
+        the first unchecked line containing task_text (handles {ID} prefixes
+        and [depends:] suffixes when only display text is known). A hint
+        index that still holds the exact line skips the scan.
+        """
+        target = f"- [ ] {task_text}"
+        if hint is not None and hint < len(lines) and lines[hint].strip() == target:
+            return hint
+        fallback = None
+        for i, line in enumerate(lines):
+            stripped = line.strip()
+            if stripped == target:
+                return i
+            if fuzzy and fallback is None and stripped.startswith('- [ ] ') and task_text in stripped:
+                fallback = i
+        return fallback
 
-        self._log_activity({
-            "timestamp": datetime.now().isoformat(),
-            "agent": "orchestrator",
-            "action": "Task modified",
-            "details": f"Changed to: {new_task[:100]}"
-        })
+    def _locate_open_task(self, lines: List[str], task_text: str, fuzzy: bool = False) -> Optional[int]:
+        """_find_open_task_line with the line index from the last parse as a hint.
 
-    async def _remove_task_from_todo(self, task_text: str):
-        """Remove a task from TODO.md."""
-        todo_path = os.path.join(self.project_path, "TODO.md")
-        if not os.path.exists(todo_path):
+        The hint is an O(1) hit while the line hasn't moved; after edits
+        shift lines it simply misses and the scan runs.
+        """
+        return self._find_open_task_line(
+            lines, task_text, fuzzy=fuzzy, hint=self._todo_line_index.get(task_text)
+        )
+
+    async def _debounced_todo_flush(self):
+        """Coalesce bursts of TODO edits into a single write."""
+        await asyncio.sleep(self._TODO_FLUSH_DELAY)
+        async with self.todo_lock:
+            await self._flush_todo()
+
+    async def _flush_todo(self):
+        """Write cached TODO.md content to disk if it has unflushed edits.
+
+        The file is checked first, so changes made to it since it was read
+        are merged (pending edits replayed on top) instead of overwritten.
+        """
+        if not self._todo_dirty:
             return
+        lines = await asyncio.to_thread(self._load_todo)
+        await asyncio.to_thread(_write_text, self._todo_path, '\n'.join(lines))
+        self._todo_dirty = False
+        self._todo_pending_edits.clear()
+        try:
+            st = os.stat(self._todo_path)
+            self._todo_stat = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            self._todo_stat = None
 
+    async def flush_todo(self):
+        """Flush pending TODO.md edits now (before handing the file to others)."""
         async with self.todo_lock:
-            async with aiofiles.open(todo_path, 'r', encoding='utf-8') as f:
-                content = await f.read()
+            await self._flush_todo()
+
+    async def _modify_task_in_todo(self, old_task: str, new_task: str):
+        """Modify a task in TODO.md."""
+        def edit(lines: List[str]) -> bool:
+            idx = self._locate_open_task(lines, old_task)
+            if idx is None:
+                return False
+            lines[idx] = lines[idx].replace(f"- [ ] {old_task}", f"- [ ] {new_task}", 1)
+            return True
+
+        if await self._edit_todo(edit) is None:
+            return
+        self._log_event("Task modified", f"Changed to: {new_task[:100]}")
 
+    async def _remove_task_from_todo(self, task_text: str):
+        """Remove a task from TODO.md."""
+        def edit(lines: List[str]) -> bool:
             # Remove the task line
-            old_line = f"- [ ] {task_text}"
-            content = content.replace(old_line + "\n", "")
-            content = content.replace(old_line, "")  # In case it's the last line
+            idx = self._locate_open_task(lines, task_text)
+            if idx is None:
+                return False
+            del lines[idx]
+            return True
 
-            async with aiofiles.open(todo_path, 'w', encoding='utf-8') as f:
-                await f.write(content)
+        if await self._edit_todo(edit) is None:
+            return
+        self._log_event("Task removed", task_text[:100])
 
-        self._log_activity({
-            "timestamp": datetime.now().isoformat(),
-            "agent": "orchestrator",
-            "action": "Task removed",
-            "details": task_text[:100]
-        })
+    # Complexity heuristics compiled to one alternation each, so a task is
+    # classified in a single C-level scan instead of one `in` check per phrase
+    _SMALL_TASK_RE = re.compile('|'.join(map(re.escape, _SMALL_TASK_INDICATORS)))
+    _LARGE_TASK_RE = re.compile('|'.join(map(re.escape, _LARGE_TASK_INDICATORS)))
 
-    async def _estimate_task_complexity(self, task: str) -> str:
+    def _estimate_task_complexity(self, task: str) -> str:
         """
         Estimate task complexity: small, medium, or large.
         Uses quick heuristics only (no LLM call) for speed.
         """
-        task_lower = task.lower()
+        task_len = len(task)
 
-        # Quick heuristics for obvious cases
-        small_indicators = ['fix typo', 'update text', 'change color', 'rename', 'add comment', 'remove unused']
-        large_indicators = ['implement', 'create full', 'build complete', 'design and implement',
-                          'refactor entire', 'migrate', 'integrate', 'authentication system',
-                          'database schema', 'api endpoints', 'full crud']
+        # Short tasks are small without needing a keyword scan
+        if task_len < 50:
+            return "small"
 
-        # Check for small tasks
-        if any(ind in task_lower for ind in small_indicators) or len(task) < 50:
+        task_lower = task.lower()
+        if self._SMALL_TASK_RE.search(task_lower):
             return "small"
 
         # Check for large tasks
-        if any(ind in task_lower for ind in large_indicators) or len(task) > 200:
+        if task_len > 200 or self._LARGE_TASK_RE.search(task_lower):
             return "large"
 
-        # For medium-complexity or uncertain tasks, ask PM for quick estimate
-        return "medium"  # Default to medium for uncertain cases
+        # Uncertain cases default to medium; no PM/LLM round-trip is made here,
+        # so there is nothing worth caching per task
+        return "medium"
 
-    async def _split_large_task(self, task: str) -> List[str]:
+    def _split_large_task(self, task: str) -> List[str]:
         """Split a large task into smaller subtasks."""
-        self._log_activity({
-            "timestamp": datetime.now().isoformat(),
-            "agent": "orchestrator",
-            "action": "Splitting large task",
-            "details": task[:100]
-        })
+        self._log_event("Splitting large task", task[:100])
         # Heuristic split for speed: split on sentence-like separators or "and then"
-        separators = ["\n", ";", " and then ", " then ", ". "]
         parts = [task]
-        for sep in separators:
+        for sep in _SUBTASK_SEPARATORS:
             if sep in task:
-                parts = [p.strip() for p in task.split(sep) if p.strip()]
+                parts = []
+                for part in task.split(sep):
+                    # Drop list markers such as "1." / "2)" / "-" left by line splits
+                    part = _SUBTASK_PREFIX_RE.sub('', part.strip(), count=1)
+                    if part:
+                        parts.append(part)
+                        if len(parts) == _MAX_SUBTASKS:
+                            break
                 break
 
         # Keep reasonable subtasks only if we got multiple meaningful parts
         if len(parts) >= 2:
-            subtasks = [p if p.endswith('.') else p for p in parts]
-            return subtasks[:4]
+            return parts
 
         # Fallback: return original task if splitting is not obvious
         return [task]
@@ -386,54 +787,29 @@ Please reply with one of: retry, skip, modify, remove, or stop"""
         [depends: ...] suffixes, not just the display text.
         Returns True if replacement succeeded, False otherwise.
         """
-        todo_path = os.path.join(self.project_path, "TODO.md")
-        if not os.path.exists(todo_path):
-            return False
-
-        async with self.todo_lock:
-            async with aiofiles.open(todo_path, 'r', encoding='utf-8') as f:
-                content = await f.read()
-
-            new_lines = "\n".join([f"- [ ] {st}" for st in subtasks])
-
-            # Try exact match first
-            old_line = f"- [ ] {original_task}"
-            if old_line in content:
-                content = content.replace(old_line, new_lines)
-            else:
-                # Fuzzy match: find the uncompleted TODO line that contains the
-                # display text (handles {ID} prefix and [depends:] suffix)
-                replaced = False
-                lines = content.split('\n')
-                for i, line in enumerate(lines):
-                    stripped = line.strip()
-                    if stripped.startswith('- [ ] ') and original_task in stripped:
-                        lines[i] = new_lines
-                        replaced = True
-                        break
-                if replaced:
-                    content = '\n'.join(lines)
-                else:
-                    self._log_activity({
-                        "timestamp": datetime.now().isoformat(),
-                        "agent": "orchestrator",
-                        "action": "Split replacement failed",
-                        "details": f"Could not find TODO line matching: {original_task[:80]}"
-                    })
-                    return False
+        def edit(lines: List[str]) -> bool:
+            # Exact raw-line match first, then the uncompleted line containing
+            # the display text (handles {ID} prefix and [depends:] suffix)
+            idx = self._locate_open_task(lines, original_task, fuzzy=True)
+            if idx is None:
+                return False
+            lines[idx:idx + 1] = [f"- [ ] {st}" for st in subtasks]
+            return True
 
-            async with aiofiles.open(todo_path, 'w', encoding='utf-8') as f:
-                await f.write(content)
+        replaced = await self._edit_todo(edit)
+        if replaced is None:
+            return False
+        if not replaced:
+            self._log_event(
+                "Split replacement failed",
+                f"Could not find TODO line matching: {original_task[:80]}"
+            )
+            return False
 
-        self._log_activity({
-            "timestamp": datetime.now().isoformat(),
-            "agent": "orchestrator",
-            "action": "Task split into subtasks",
-            "details": f"Created {len(subtasks)} subtasks"
-        })
+        self._log_event("Task split into subtasks", f"Created {len(subtasks)} subtasks")
         return True
 
-    async def _suggest_simpler_task(self, original_task: str, error: str) -> str:
+    def _suggest_simpler_task(self, original_task: str, error: str) -> str:
         """Create a simpler version of a failed task using local heuristics.
 
         Avoids burning a full CLI round-trip (and its tokens) just to rephrase a string.
@@ -457,7 +833,7 @@ Please reply with one of: retry, skip, modify, remove, or stop"""
     ) -> str:
         """Route a message from one agent to another."""
         self._log_activity({
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": time.time_ns(),
             "agent": from_agent,
             "action": f"Message to {to_agent}",
             "details": message[:100]
@@ -484,7 +860,7 @@ Please reply with one of: retry, skip, modify, remove, or stop"""
     async def request_human_input(self, agent: str, question: str) -> str:
         """Request input from the human user."""
         self._log_activity({
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": time.time_ns(),
             "agent": agent,
             "action": "Requesting human input",
             "details": question
@@ -495,7 +871,7 @@ Please reply with one of: retry, skip, modify, remove, or stop"""
             self.pending_human_input = {
                 "agent": agent,
                 "question": question,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": now_iso()
             }
             self.human_input_event.clear()
 
@@ -518,6 +894,58 @@ Please reply with one of: retry, skip, modify, remove, or stop"""
             self.pending_human_input["response"] = response
             self.human_input_event.set()
 
+    @contextlib.asynccontextmanager
+    async def _run_slot(self):
+        """Hold one of max_concurrent agent-run slots for the duration of the block."""
+        async with self._slot_cond:
+            await self._slot_cond.wait_for(lambda: self._in_flight < self.max_concurrent)
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            async with self._slot_cond:
+                self._in_flight -= 1
+                self._slot_cond.notify(1)
+
+    async def set_max_concurrent(self, n: int):
+        """Change how many agents may run at once, effective immediately.
+
+        Raising the limit admits waiting runs right away; lowering it lets
+        in-flight runs finish and admits no new ones until below the limit.
+        """
+        async with self._slot_cond:
+            self.max_concurrent = max(1, int(n))
+            self._slot_cond.notify_all()
+
+    def _model_slot(self, agent) -> Any:
+        """Return the per-model semaphore for an agent's runs, if one is configured.
+
+        Logs the wait when the model is already at its limit so a queue
+        building up behind one model shows in the activity feed.
+        """
+        slot = self._model_slots.get(agent.model_preference)
+        if slot is None:
+            return contextlib.nullcontext()
+        if slot.locked():
+            self._log_event(
+                "Waiting for model slot",
+                f"{agent.name} queued for {agent.model_preference}"
+            )
+        return slot
+
+    def _retry_delay(self, attempt: int) -> float:
+        """Seconds to wait before retry number `attempt` (1-based).
+
+        Exponential backoff from retry_backoff_initial, capped at
+        retry_backoff_max, plus up to a second of jitter so agents that
+        failed together do not retry in lockstep. An initial delay of 0
+        disables the backoff.
+        """
+        if self.retry_backoff_initial <= 0:
+            return 0.0
+        delay = min(self.retry_backoff_max, self.retry_backoff_initial * 2 ** (attempt - 1))
+        return delay + random.uniform(0, 1)
+
     async def assign_task(
         self,
         agent_name: str,
@@ -529,12 +957,7 @@ Please reply with one of: retry, skip, modify, remove, or stop"""
         if agent_name not in self.agents:
             return {"status": "error", "result": f"Unknown agent: {agent_name}"}
 
-        self._log_activity({
-            "timestamp": datetime.now().isoformat(),
-            "agent": "orchestrator",
-            "action": f"Assigning task to {agent_name}",
-            "details": f"[{priority}] {task[:100]}"
-        })
+        self._log_event(f"Assigning task to {agent_name}", f"[{priority}] {task[:100]}")
 
         agent = self.agents[agent_name]
 
@@ -560,10 +983,13 @@ Please reply with one of: retry, skip, modify, remove, or stop"""
 
             try:
                 # Notify UI that agent is starting
-                await self._notify_agent_start(agent_name)
+                self._notify_agent_start(agent_name)
 
-                # Use semaphore to limit concurrent agents
-                async with self.semaphore:
+                # Narrowest first (agent, model, shared) so a waiting run holds no shared slot
+                agent_queue = (self._agent_locks[agent_name] if self.session_continuity
+                               else contextlib.nullcontext())
+                model_slot = self._model_slot(agent)
+                async with agent_queue, model_slot, self._run_slot():
                     result = await agent.process_task(
                         task=effective_task,
                         project_path=self.project_path,
@@ -574,7 +1000,7 @@ Please reply with one of: retry, skip, modify, remove, or stop"""
                     )
 
                 # Notify UI that agent finished
-                await self._notify_agent_complete(agent_name)
+                self._notify_agent_complete(agent_name)
 
                 if result["status"] == "complete":
                     # Update memory with result
@@ -585,12 +1011,7 @@ Please reply with one of: retry, skip, modify, remove, or stop"""
                 if result["status"] == "timeout":
                     # Don't retry timeouts — same prompt will likely timeout again
                     self.total_failures += 1
-                    self._log_activity({
-                        "timestamp": datetime.now().isoformat(),
-                        "agent": "orchestrator",
-                        "action": "Timeout",
-                        "details": f"{self.task_timeout}s"
-                    })
+                    self._log_event("Timeout", f"{self.task_timeout}s")
                     await self._log_error(
                         error_type="timeout",
                         task=task,
@@ -603,16 +1024,14 @@ Please reply with one of: retry, skip, modify, remove, or stop"""
                     }
 
             except Exception as e:
-                await self._notify_agent_complete(agent_name)
+                self._notify_agent_complete(agent_name)
                 self.total_failures += 1
-                error_msg = str(e).encode('ascii', errors='replace').decode('ascii')
+                error_msg = to_ascii(str(e))
                 last_error = error_msg
-                self._log_activity({
-                    "timestamp": datetime.now().isoformat(),
-                    "agent": "orchestrator",
-                    "action": f"Task error ({retries + 1}/{self.max_task_retries})",
-                    "details": error_msg[:200]
-                })
+                self._log_event(
+                    f"Task error ({retries + 1}/{self.max_task_retries})",
+                    error_msg[:200]
+                )
                 await self._log_error(
                     error_type="exception",
                     task=task,
@@ -630,13 +1049,20 @@ Please reply with one of: retry, skip, modify, remove, or stop"""
                     error_details=f"Critical failure threshold reached ({self.total_failures} failures). Work stopped.",
                     agent=agent_name
                 )
-                await self._send_message(
+                await self.flush_logs()
+                self._send_message(
                     "critical_error",
                     f"Too many failures ({self.total_failures}). Stopping work. Please check the logs and error_log.md."
                 )
                 self.is_working = False
                 return {"status": "critical_error", "result": "Too many failures"}
 
+            # Back off before the next attempt so a rate-limited or overloaded
+            # upstream has time to recover. The run slot was released when the
+            # attempt ended, so other agents can use it while this one waits.
+            if retries < self.max_task_retries:
+                await asyncio.sleep(self._retry_delay(retries))
+
         # Return error after max retries
         return {
             "status": "error",
@@ -651,12 +1077,7 @@ Please reply with one of: retry, skip, modify, remove, or stop"""
     async def start_project_kickoff(self, initial_request: str) -> Dict[str, Any]:
         """Start a new project with the PM asking kickoff questions."""
         self._reset_all_sessions()
-        self._log_activity({
-            "timestamp": datetime.now().isoformat(),
-            "agent": "orchestrator",
-            "action": "Starting project kickoff",
-            "details": initial_request[:100]
-        })
+        self._log_event("Starting project kickoff", initial_request[:100])
 
         pm = self.agents["project_manager"]
 
@@ -682,21 +1103,15 @@ If the project involves Python, make sure the TODO list includes, near the top,
     async def start_feature_request(self, feature_request: str) -> Dict[str, Any]:
         """Handle a new feature request on an existing project."""
         self._reset_all_sessions()
-        self._log_activity({
-            "timestamp": datetime.now().isoformat(),
-            "agent": "orchestrator",
-            "action": "Starting feature request",
-            "details": feature_request[:100]
-        })
+        self._log_event("Starting feature request", feature_request[:100])
 
         pm = self.agents["project_manager"]
 
-        # Load existing spec if available
-        spec_path = os.path.join(self.project_path, "SPEC.md")
-        existing_spec = ""
-        if os.path.exists(spec_path):
-            with open(spec_path, 'r') as f:
-                existing_spec = f.read()
+        # Load existing spec and the memory summary concurrently
+        existing_spec, project_summary = await asyncio.gather(
+            self._read_spec(),
+            asyncio.to_thread(self.memory.get_project_summary)
+        )
 
         feature_task = f"""A user wants to add a new feature to an existing project.
 
@@ -713,22 +1128,31 @@ If the project involves Python, ensure the TODO list includes, near the top, a t
         result = await pm.process_task(
             task=feature_task,
             project_path=self.project_path,
-            context=self.memory.get_project_summary(),
+            context=project_summary,
             orchestrator=self,
             config=self.config
         )
 
         return result
 
+    async def _read_spec(self) -> str:
+        """Return SPEC.md content ("" if missing), re-reading only when its mtime changed."""
+        spec_path = os.path.join(self.project_path, "SPEC.md")
+        try:
+            st = await asyncio.to_thread(os.stat, spec_path)
+        except OSError:
+            self._spec_cache = None
+            return ""
+        if self._spec_cache and self._spec_cache[0] == st.st_mtime_ns:
+            return self._spec_cache[1]
+        content = await asyncio.to_thread(_read_text, spec_path)
+        self._spec_cache = (st.st_mtime_ns, content)
+        return content
+
     def request_pause(self):
         """Request a pause after the current task completes."""
         self.pause_requested = True
-        self._log_activity({
-            "timestamp": datetime.now().isoformat(),
-            "agent": "orchestrator",
-            "action": "Pause requested",
-            "details": "Will stop after current task completes"
-        })
+        self._log_event("Pause requested", "Will stop after current task completes")
 
     async def force_stop(self, reason: str = "Force stop requested"):
         """Force stop all current activity immediately."""
@@ -749,120 +1173,215 @@ If the project involves Python, ensure the TODO list includes, near the top, a t
         if self.work_task and not self.work_task.done():
             self.work_task.cancel()
 
-        self._log_activity({
-            "timestamp": datetime.now().isoformat(),
-            "agent": "orchestrator",
-            "action": "Force stop",
-            "details": reason
-        })
-        await self._send_message("work_stopped", "Work force-stopped.")
+        # Drain buffered TODO edits and error entries now; the caller may drop
+        # this orchestrator right after, before the debounced flushes fire
+        await self.flush_todo()
+        await self.flush_logs()
 
-    async def _send_message(self, msg_type: str, message: str, **kwargs):
-        """Send a message to the frontend."""
+        self._log_event("Force stop", reason)
+        self._send_message("work_stopped", "Work force-stopped.")
+
+    # Outbound queue length beyond which low-value messages are dropped
+    _MSG_QUEUE_SIZE = 256
+    # The only message types that may be dropped; escalations, UAT and
+    # start/stop/error notices are always delivered
+    _DROPPABLE_MESSAGE_TYPES = frozenset({"debug_output", "info"})
+
+    def _send_message(self, msg_type: str, message: str, **kwargs):
+        """Queue a message for the frontend without waiting on the UI callback.
+
+        A single consumer task delivers messages in order; if the queue is
+        full the oldest droppable message goes so agents never block on the UI.
+        """
         if self.message_callback:
             msg = {
                 "type": msg_type,
                 "message": message,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": time.time_ns()
             }
             msg.update(kwargs)
-            await self.message_callback(msg)
+            self._enqueue_message(msg)
+
+    def _enqueue_message(self, msg: Dict[str, Any]):
+        """Put a UI message (timestamp as time.time_ns()) on the outbound queue."""
+        queue = self._msg_queue
+        if len(queue) >= self._MSG_QUEUE_SIZE:
+            droppable = self._DROPPABLE_MESSAGE_TYPES
+            victim = next((m for m in queue if m["type"] in droppable), None)
+            if victim is not None:
+                queue.remove(victim)
+            elif msg["type"] in droppable:
+                # Queue holds only messages that must be delivered
+                return
+        queue.append(msg)
+        if self._msg_consumer_task is None or self._msg_consumer_task.done():
+            self._msg_consumer_task = asyncio.create_task(self._drain_messages())
+
+    async def _drain_messages(self):
+        """Deliver queued messages to the UI callback until the queue is empty.
+
+        Everything queued since the last delivery goes out as one frame: a
+        single message as-is, several as {"type": "batch", "messages": [...]}.
+        """
+        # Yield once before the first send: under an eager task factory this
+        # task starts inside the first _send_message, before the burst is queued
+        await asyncio.sleep(0)
+        queue = self._msg_queue
+        while queue:
+            batch = []
+            while queue:
+                msg = queue.popleft()
+                msg["timestamp"] = fmt_ts(msg["timestamp"])
+                batch.append(msg)
+            frame = batch[0] if len(batch) == 1 else {"type": "batch", "messages": batch}
+            try:
+                await self.message_callback(frame)
+            except Exception:
+                # A failing UI callback must not take down the orchestrator
+                pass
 
-    async def _notify_agent_start(self, agent_name: str):
+    def _notify_agent_start(self, agent_name: str):
         """Notify UI that an agent started working."""
-        await self._send_message("agent_start", f"{agent_name} started", agent=agent_name)
+        self._send_message("agent_start", f"{agent_name} started", agent=agent_name)
 
-    async def _notify_agent_complete(self, agent_name: str):
+    def _notify_agent_complete(self, agent_name: str):
         """Notify UI that an agent finished working."""
-        await self._send_message("agent_complete", f"{agent_name} finished", agent=agent_name)
-
-    # Regex for parsing task lines with optional {ID} and [depends: ...] tags
-    _TASK_PATTERN = re.compile(
-        r'^- \[(?P<check>[ xX])\]\s*'          # checkbox
-        r'(?:\{(?P<id>\d+)\}\s*)?'              # optional {ID}
-        r'(?P<text>.*?)'                        # task text (non-greedy)
-        r'(?:\s*\[depends:\s*(?P<deps>[\d,\s]+)\])?' # optional [depends: ...]
-        r'\s*$'
+        self._send_message("agent_complete", f"{agent_name} finished", agent=agent_name)
+
+    # One pattern classifies a TODO line as a section header or a task line
+    # (with optional {ID} and [depends: ...] tags) in a single match
+    _TODO_LINE_PATTERN = re.compile(
+        r'^\s*(?:'
+        r'## \s*(?P<section>\S.*?)'                 # section header
+        r'|'
+        r'- \[(?P<check>[ xX])\]\s*'                # checkbox
+        r'(?:\{(?P<id>\d+)\}\s*)?'                  # optional {ID}
+        r'(?P<text>.*?)'                            # task text (non-greedy)
+        r'(?:\s*\[depends:\s*(?P<deps>[\d,\s]+)\])?'  # optional [depends: ...]
+        r')\s*$'
     )
+    # Most task lines carry neither tag; those skip the optional groups
+    _TODO_PLAIN_TASK_PATTERN = re.compile(r'^\s*- \[(?P<check>[ xX])\]\s*(?P<text>.*?)\s*$')
 
     def _parse_todo_tasks(self) -> List[Dict[str, Any]]:
-        """Parse TODO.md and return list of tasks with their status and dependencies."""
-        todo_path = os.path.join(self.project_path, "TODO.md")
-        if not os.path.exists(todo_path):
-            return []
+        """Parse TODO.md and return list of tasks with their status and dependencies.
 
-        with open(todo_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        Works on the cached TODO lines only and never touches the file, so it
+        is safe to call on the event loop; _refresh_todo_schedule brings the
+        cache up to date first. The result is reused until the TODO lines
+        change, so back-to-back scheduling calls parse once. Callers must not
+        mutate it.
+        """
+        lines = self._todo_lines
+        if lines is None:
+            return []
+        if self._parsed_todo is not None and self._parsed_todo[0] == self._todo_version:
+            return self._parsed_todo[1]
 
         tasks = []
         current_section = "General"
-
-        for line in content.split('\n'):
-            stripped = line.strip()
-
-            # Detect section headers
-            if stripped.startswith('## '):
-                current_section = stripped[3:].strip()
+        match_line = self._TODO_LINE_PATTERN.match
+        match_plain_task = self._TODO_PLAIN_TASK_PATTERN.match
+        line_index = {}
+
+        for line_no, line in enumerate(lines):
+            # Only headers and checkbox lines can match; prose, blank lines
+            # and code blocks are skipped without entering the regex engine
+            stripped = line.lstrip()
+            if stripped.startswith('- ['):
+                if '{' not in line and '[depends' not in line:
+                    m = match_plain_task(line)
+                    if not m:
+                        continue
+                    task_id_str = deps_str = None
+                else:
+                    m = match_line(line)
+                    if not m:
+                        continue
+                    task_id_str = m.group('id')
+                    deps_str = m.group('deps')
+            elif stripped.startswith('## ') or stripped.rstrip() == '##':
+                m = match_line(line)
+                # A bare "## " header ends the previous section without naming one
+                current_section = m.group('section') if m else ""
                 continue
-
-            m = self._TASK_PATTERN.match(stripped)
-            if m:
-                check = m.group('check')
-                task_id_str = m.group('id')
-                text = m.group('text').strip()
-                deps_str = m.group('deps')
-
-                task_id = int(task_id_str) if task_id_str else None
-                depends_on = []
-                if deps_str:
-                    depends_on = [int(d.strip()) for d in deps_str.split(',') if d.strip().isdigit()]
-
-                # Build the full raw text (with {ID} and [depends:]) for matching during completion
-                raw_text = text
-                if task_id is not None:
-                    raw_text = f"{{{task_id}}} {text}"
-                if depends_on:
-                    raw_text += f" [depends: {', '.join(str(d) for d in depends_on)}]"
-
-                tasks.append({
-                    "text": raw_text,
-                    "display_text": text,  # clean text without ID/deps for agent prompt
-                    "completed": check in ('x', 'X'),
-                    "section": current_section,
-                    "id": task_id,
-                    "depends_on": depends_on
-                })
             else:
-                # Fallback: parse plain checkbox lines without ID/deps (legacy format)
-                if stripped.startswith('- [ ] '):
-                    tasks.append({
-                        "text": stripped[6:].strip(),
-                        "display_text": stripped[6:].strip(),
-                        "completed": False,
-                        "section": current_section,
-                        "id": None,
-                        "depends_on": []
-                    })
-                elif stripped.startswith('- [x] ') or stripped.startswith('- [X] '):
-                    tasks.append({
-                        "text": stripped[6:].strip(),
-                        "display_text": stripped[6:].strip(),
-                        "completed": True,
-                        "section": current_section,
-                        "id": None,
-                        "depends_on": []
-                    })
+                continue
 
+            text = m.group('text').strip()
+
+            task_id = int(task_id_str) if task_id_str else None
+            depends_on = []
+            if deps_str:
+                depends_on = [int(d.strip()) for d in deps_str.split(',') if d.strip().isdigit()]
+
+            # Build the full raw text (with {ID} and [depends:]) for matching during completion
+            raw_text = text
+            if task_id is not None:
+                raw_text = f"{{{task_id}}} {text}"
+            if depends_on:
+                raw_text += f" [depends: {', '.join(str(d) for d in depends_on)}]"
+            line_index.setdefault(raw_text, line_no)
+
+            tasks.append({
+                "text": raw_text,
+                "display_text": text,  # clean text without ID/deps for agent prompt
+                "completed": m.group('check') in ('x', 'X'),
+                "section": current_section,
+                "id": task_id,
+                "depends_on": depends_on
+            })
+
+        self._todo_line_index = line_index
+        self._parsed_todo = (self._todo_version, tasks)
         return tasks
 
-    def _get_next_task(self) -> Optional[Dict[str, Any]]:
-        """Get the next uncompleted, dependency-ready task from TODO.md."""
+    def _todo_schedule(self) -> Tuple[List[Dict[str, Any]], Dict[str, float]]:
+        """Ready tasks (open, dependencies met) in TODO order, plus each section's completed fraction.
+
+        Derived from the parsed tasks and reused with them, so repeated
+        scheduling calls on an unchanged TODO skip the dependency checks.
+        """
         tasks = self._parse_todo_tasks()
+        cached = self._todo_schedule_cache
+        if cached is not None and cached[0] == self._todo_version:
+            return cached[1], cached[2]
+
         completed_ids = self._get_completed_task_ids(tasks)
-        for task in tasks:
-            if not task["completed"] and self._is_task_ready(task, completed_ids):
-                return task
-        return None
+        section_total: Dict[str, int] = {}
+        section_done: Dict[str, int] = {}
+        ready: List[Dict[str, Any]] = []
+        for t in tasks:
+            section = t["section"]
+            section_total[section] = section_total.get(section, 0) + 1
+            if t["completed"]:
+                section_done[section] = section_done.get(section, 0) + 1
+            elif self._is_task_ready(t, completed_ids):
+                ready.append(t)
+        progress = {s: section_done.get(s, 0) / total for s, total in section_total.items()}
+
+        self._todo_schedule_cache = (self._todo_version, ready, progress)
+        return ready, progress
+
+    async def _refresh_todo_schedule(self):
+        """Bring the TODO caches up to date in a worker thread.
+
+        Reading a changed TODO.md and re-parsing it happen off the event
+        loop; the synchronous scheduling calls that follow in the same tick
+        then read the cached snapshot. todo_lock keeps edits from touching
+        the lines meanwhile.
+        """
+        def refresh():
+            self._load_todo()
+            self._todo_schedule()
+
+        async with self.todo_lock:
+            await asyncio.to_thread(refresh)
+
+    def _get_next_task(self) -> Optional[Dict[str, Any]]:
+        """Get the next uncompleted, dependency-ready task from TODO.md."""
+        ready, _ = self._todo_schedule()
+        return ready[0] if ready else None
 
     def _get_completed_task_ids(self, tasks: List[Dict[str, Any]]) -> Set[int]:
         """Get the set of completed task IDs."""
@@ -870,63 +1389,56 @@ If the project involves Python, ensure the TODO list includes, near the top, a t
 
     def _is_task_ready(self, task: Dict[str, Any], completed_ids: Set[int]) -> bool:
         """Check if a task's dependencies are all satisfied."""
-        if not task["depends_on"]:
-            return True
-        return all(dep_id in completed_ids for dep_id in task["depends_on"])
+        depends_on = task["depends_on"]
+        # Most tasks have no dependencies; the rest take one C-level subset check
+        return not depends_on or completed_ids.issuperset(depends_on)
 
-    def _get_parallel_tasks(self, max_tasks: int = None) -> List[Dict[str, Any]]:
+    def _get_parallel_tasks(self, max_tasks: int = None,
+                            exclude: Optional[Set[str]] = None) -> List[Dict[str, Any]]:
         """
         Get a batch of tasks that can run in parallel.
         Only returns tasks whose dependencies are fully satisfied.
         Prefers tasks from the same section, but allows cross-section batching.
+        Sections closest to completion go first so work in progress drains
+        before fresh sections are opened; tasks in exclude (e.g. skipped
+        ones) are left out before the batch is filled.
         """
         if max_tasks is None:
             max_tasks = self.max_concurrent
 
-        tasks = self._parse_todo_tasks()
-        completed_ids = self._get_completed_task_ids(tasks)
-        uncompleted = [t for t in tasks if not t["completed"]]
-
-        # Filter to only dependency-ready tasks
-        ready = [t for t in uncompleted if self._is_task_ready(t, completed_ids)]
-
+        ready, progress = self._todo_schedule()
+        if exclude:
+            ready = [t for t in ready if t["text"] not in exclude]
         if not ready:
             return []
 
-        # Start with the first section for locality
-        first_section = ready[0]["section"]
-        batch: List[Dict[str, Any]] = []
-
-        # Add tasks from the first section
-        for t in ready:
-            if t["section"] == first_section:
-                batch.append(t)
-                if len(batch) >= max_tasks:
-                    return batch
-
+        # Most-complete section first; sorted() is stable, so ties keep TODO order
+        sections = sorted(
+            dict.fromkeys(t["section"] for t in ready),
+            key=lambda s: -progress[s]
+        )
         if not self.allow_cross_section_parallel:
-            return batch
+            sections = sections[:1]
 
-        # Fill remaining slots with tasks from other sections, preserving order
-        for t in ready:
-            if t["section"] != first_section:
-                batch.append(t)
-                if len(batch) >= max_tasks:
-                    break
+        batch: List[Dict[str, Any]] = []
+        for section in sections:
+            for t in ready:
+                if t["section"] == section:
+                    batch.append(t)
+                    if len(batch) >= max_tasks:
+                        return batch
 
         return batch
 
+    # All unbatchable indicators in one alternation: a single scan per task
+    _UNBATCHABLE_TASK_RE = re.compile('|'.join(map(re.escape, _UNBATCHABLE_TASK_INDICATORS)))
+
     def _is_small_task(self, task_text: str) -> bool:
         """Heuristic to decide if a task is small enough to batch."""
         text = task_text.lower().strip()
         if len(text) > 150:
             return False
-        large_indicators = [
-            "refactor", "migrate", "architecture",
-            "authentication", "authorization", "database schema", "full crud",
-            "design and implement", "build complete"
-        ]
-        return not any(ind in text for ind in large_indicators)
+        return not self._UNBATCHABLE_TASK_RE.search(text)
 
     def _batch_tasks_by_section(self, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Batch small tasks in the same section into a single work item."""
@@ -940,11 +1452,13 @@ If the project involves Python, ensure the TODO list includes, near the top, a t
             section = current["section"]
             group = [current]
             j = i + 1
-            while j < len(tasks) and len(group) < self.task_batch_size:
+            # A large task starts no batch; classify it once, not per candidate
+            current_small = self._is_small_task(current.get("display_text", current["text"]))
+            while current_small and j < len(tasks) and len(group) < self.task_batch_size:
                 candidate = tasks[j]
                 if candidate["section"] != section:
                     break
-                if not self._is_small_task(candidate.get("display_text", candidate["text"])) or not self._is_small_task(current.get("display_text", current["text"])):
+                if not self._is_small_task(candidate.get("display_text", candidate["text"])):
                     break
                 group.append(candidate)
                 j += 1
@@ -967,17 +1481,23 @@ If the project involves Python, ensure the TODO list includes, near the top, a t
 
         return batched
 
-    async def _execute_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute a single task and return the result."""
+    async def _execute_task(self, task: Dict[str, Any], memory_context: Optional[str] = None) -> Dict[str, Any]:
+        """Execute a single task and return the result.
+
+        memory_context may be precomputed for a whole batch via
+        MemoryManager.get_contexts_for_tasks; otherwise it is fetched here.
+        """
         task_text = task.get("display_text", task["text"])
-        start_time = datetime.now()
+        start_ns = time.time_ns()
+        # Duration comes from the monotonic clock, immune to wall-clock jumps
+        start_mono = time.monotonic()
 
-        # Log task start with timestamp
+        # Log task start with timestamp (HH:MM:SS out of the ISO string)
         self._log_activity({
-            "timestamp": start_time.isoformat(),
+            "timestamp": start_ns,
             "agent": "orchestrator",
             "action": "Task started",
-            "details": f"[{start_time.strftime('%H:%M:%S')}] {task_text[:80]}..."
+            "details": f"[{fmt_ts(start_ns)[11:19]}] {task_text[:80]}..."
         })
 
         # Estimate complexity (skip for batched tasks)
@@ -985,25 +1505,20 @@ If the project involves Python, ensure the TODO list includes, near the top, a t
         # from appended retry messages like "(Previous attempt failed: ...)"
         complexity = "medium"
         if "batch" not in task:
-            complexity = await self._estimate_task_complexity(task.get("display_text", task_text))
+            complexity = self._estimate_task_complexity(task.get("display_text", task_text))
 
-        self._log_activity({
-            "timestamp": datetime.now().isoformat(),
-            "agent": "orchestrator",
-            "action": f"Task complexity: {complexity.upper()}",
-            "details": task_text[:50]
-        })
+        self._log_event(f"Task complexity: {complexity.upper()}", task_text[:50])
 
         # If task is large, split it into subtasks
         if complexity == "large" and "batch" not in task:
-            await self._send_message("info", f"Large task detected, splitting: {task_text[:40]}...")
+            self._send_message("info", f"Large task detected, splitting: {task_text[:40]}...")
 
-            subtasks = await self._split_large_task(task_text)
+            subtasks = self._split_large_task(task_text)
 
             if len(subtasks) > 1:
                 replaced = await self._replace_task_with_subtasks(task_text, subtasks)
                 if replaced:
-                    await self._send_message("info", f"Split into {len(subtasks)} subtasks")
+                    self._send_message("info", f"Split into {len(subtasks)} subtasks")
 
                     # Return special status to indicate task was split (not executed)
                     return {
@@ -1017,7 +1532,8 @@ If the project involves Python, ensure the TODO list includes, near the top, a t
         agent_name = self._determine_agent_for_task(task_text)
 
         mgmt_port = self.config.get("server_port", 8080)
-        memory_context = self.memory.get_context_for_task(task_text, section=task['section'])
+        if memory_context is None:
+            memory_context = self.memory.get_context_for_task(task_text, section=task['section'])
         task_context = f"Section: {task['section']}\nAvoid port {mgmt_port} (reserved)."
         if memory_context:
             task_context += f"\n\n{memory_context}"
@@ -1029,12 +1545,11 @@ If the project involves Python, ensure the TODO list includes, near the top, a t
         )
 
         # Log task completion with duration
-        end_time = datetime.now()
-        duration = (end_time - start_time).total_seconds()
+        duration = time.monotonic() - start_mono
         duration_str = f"{int(duration // 60)}m {int(duration % 60)}s" if duration >= 60 else f"{int(duration)}s"
 
         self._log_activity({
-            "timestamp": end_time.isoformat(),
+            "timestamp": time.time_ns(),
             "agent": agent_name,
             "action": f"Task finished ({duration_str})",
             "details": f"Status: {result['status']}"
@@ -1064,272 +1579,257 @@ If the project involves Python, ensure the TODO list includes, near the top, a t
         # Set status to WIP
         await self._set_project_status(ProjectStatus.WIP, "Work started")
 
-        self._log_activity({
-            "timestamp": datetime.now().isoformat(),
-            "agent": "orchestrator",
-            "action": "Starting work",
-            "details": f"Parallel execution enabled (max {self.max_concurrent} agents)"
-        })
+        self._log_event(
+            "Starting work",
+            f"Parallel execution enabled (max {self.max_concurrent} agents)"
+        )
 
-        await self._send_message("work_started", "Work started")
+        self._send_message("work_started", "Work started")
 
         try:
             while self.is_working and not self.pause_requested:
-                # Get batch of parallel tasks
-                tasks = self._get_parallel_tasks()
-
-                # Filter out skipped tasks
-                tasks = [t for t in tasks if t["text"] not in skipped_tasks]
+                await self._refresh_todo_schedule()
+                # Get batch of parallel tasks, filling slots past skipped ones
+                tasks = self._get_parallel_tasks(exclude=skipped_tasks)
 
                 if not tasks:
-                    # Check if there are any remaining uncompleted tasks
-                    remaining = self._get_next_task()
-                    if remaining and remaining["text"] not in skipped_tasks:
-                        tasks = [remaining]
-                    else:
-                        self._log_activity({
-                            "timestamp": datetime.now().isoformat(),
-                            "agent": "orchestrator",
-                            "action": "All tasks complete",
-                            "details": f"Completed. Skipped {len(skipped_tasks)} problematic tasks."
-                        })
-
-                        # Optional Testing phase before security
-                        testing_issues = []
-                        if self._should_run_testing_phase_now():
-                            await self._set_project_status(
-                                ProjectStatus.TESTING,
-                                "All tasks complete, starting testing"
-                            )
+                    # _get_parallel_tasks already looked at every ready task that
+                    # wasn't skipped, so an empty batch means there is nothing left
+                    self._log_event(
+                        "All tasks complete",
+                        f"Completed. Skipped {len(skipped_tasks)} problematic tasks."
+                    )
 
-                            testing_result = await self._run_testing_phase()
-                            if testing_result:
-                                testing_issues = testing_result.get("issues", []) or []
-                        else:
-                            # Smoke testing (run existing tests without testing agent)
-                            strategy = self._normalize_testing_strategy()
-                            if (self.quality_gates.get("run_tests", True)
-                                    and strategy in {"smoke", "smoke_tests", "smoke_test"}
-                                    and self._has_code_changes_since_last_review()):
-                                test_result = await self._run_tests()
-                                self.last_test_result = test_result
-                                if test_result.get("status") in {"failed", "error", "timeout"}:
-                                    testing_issues.append({
-                                        "title": "[BLOCKING] Smoke tests failed",
-                                        "description": (test_result.get("summary", "") or "tests failed").strip()[:400]
-                                    })
-
-                        if testing_issues:
-                            issues_added = await self._handle_review_issues(testing_issues, "Testing")
-                            if issues_added:
-                                continue  # Continue working on new issues
+                    # One code scan decides every gate below, so the marker
+                    # saved after security review doesn't make QA skip
+                    latest_mtime = self._get_latest_code_mtime()
+                    has_changes = self._has_code_changes_since_last_review(latest_mtime)
 
-                        # Run Security Review phase (if enabled)
-                        if self.quality_gates.get("run_security_review", True):
-                            await self._set_project_status(
-                                ProjectStatus.SECURITY_REVIEW,
-                                "All tasks complete, starting security review"
-                            )
+                    # Optional Testing phase before security
+                    testing_issues = []
+                    if self._should_run_testing_phase_now(has_changes):
+                        await self._set_project_status(
+                            ProjectStatus.TESTING,
+                            "All tasks complete, starting testing"
+                        )
 
-                            security_result = await self._run_final_security_review()
-
-                            # Check for security issues
-                            security_issues = []
-                            if security_result and security_result.get("status") == "complete":
-                                result_text = security_result.get("result", "")
-                                security_issues = self._parse_review_issues(result_text)
-
-                            if security_issues:
-                                # Issues found, add to TODO and go back to WIP
-                                issues_added = await self._handle_review_issues(security_issues, "Security")
-                                if issues_added:
-                                    continue  # Continue working on new issues
-                            else:
-                                self._save_quality_marker()
-
-                        # Security passed (or skipped), run QA Review phase
-                        qa_result = await self._run_qa_review()
-                        if qa_result and qa_result.get("status") != "skipped":
-                            await self._set_project_status(
-                                ProjectStatus.QA,
-                                "Security review passed, starting QA"
-                            )
+                        testing_result = await self._run_testing_phase(has_changes, latest_mtime)
+                        if testing_result:
+                            testing_issues = testing_result.get("issues", []) or []
+                    else:
+                        # Smoke testing (run existing tests without testing agent)
+                        if (self.quality_gates.get("run_tests", True)
+                                and self._testing_strategy_norm in _SMOKE_STRATEGIES
+                                and has_changes):
+                            test_result = await self._run_tests(has_changes, latest_mtime)
+                            self.last_test_result = test_result
+                            if test_result.get("status") in {"failed", "error", "timeout"}:
+                                testing_issues.append({
+                                    "title": "[BLOCKING] Smoke tests failed",
+                                    "description": (test_result.get("summary", "") or "tests failed").strip()[:400]
+                                })
+
+                    if testing_issues:
+                        issues_added = await self._handle_review_issues(testing_issues, "Testing")
+                        if issues_added:
+                            continue  # Continue working on new issues
+
+                    # Run Security Review phase (if enabled)
+                    if self.quality_gates.get("run_security_review", True):
+                        await self._set_project_status(
+                            ProjectStatus.SECURITY_REVIEW,
+                            "All tasks complete, starting security review"
+                        )
 
-                        # Check for blocking/major QA issues
-                        qa_issues = []
-                        if qa_result and qa_result.get("status") == "complete":
-                            result_text = qa_result.get("result", "")
+                        security_result = await self._run_final_security_review()
 
-                            # Add non-issue notes to QA notes file
-                            if "qa passed" in result_text.lower():
-                                await self._add_qa_notes(
-                                    f"QA Review completed successfully.\n\n{result_text[:1000]}",
-                                    "QA Review Notes"
-                                )
-                                self._save_quality_marker()
-                            else:
-                                qa_issues = self._parse_review_issues(result_text)
+                        # Check for security issues
+                        security_issues = []
+                        if security_result and security_result.get("status") == "complete":
+                            result_text = security_result.get("result", "")
+                            security_issues = self._parse_review_issues(result_text)
 
-                        if qa_issues:
+                        if security_issues:
                             # Issues found, add to TODO and go back to WIP
-                            issues_added = await self._handle_review_issues(qa_issues, "QA")
+                            issues_added = await self._handle_review_issues(security_issues, "Security")
                             if issues_added:
                                 continue  # Continue working on new issues
+                        else:
+                            self._save_quality_marker(latest_mtime)
 
-                        # QA passed or skipped - transition to UAT (User Acceptance Testing)
+                    # Security passed (or skipped), run QA Review phase
+                    qa_result = await self._run_qa_review(has_changes)
+                    if qa_result and qa_result.get("status") != "skipped":
                         await self._set_project_status(
-                            ProjectStatus.UAT,
-                            "Reviews complete - ready for user acceptance testing"
+                            ProjectStatus.QA,
+                            "Security review passed, starting QA"
                         )
 
-                        # Notify UI that UAT is ready
-                        await self._send_message(
-                            "uat_ready",
-                            "All automated checks passed! Ready for User Acceptance Testing. Click 'Start UAT' to begin your review."
-                        )
+                    # Check for blocking/major QA issues
+                    qa_issues = []
+                    if qa_result and qa_result.get("status") == "complete":
+                        result_text = qa_result.get("result", "")
 
-                        # Work pauses here - UAT is a user-driven conversation
-                        self._log_activity({
-                            "timestamp": datetime.now().isoformat(),
-                            "agent": "orchestrator",
-                            "action": "Awaiting UAT",
-                            "details": "Project ready for user acceptance testing"
-                        })
-                        break
+                        # Add non-issue notes to QA notes file
+                        if "qa passed" in result_text.lower():
+                            await self._add_qa_notes(
+                                f"QA Review completed successfully.\n\n{result_text[:1000]}",
+                                "QA Review Notes"
+                            )
+                            self._save_quality_marker(latest_mtime)
+                        else:
+                            qa_issues = self._parse_review_issues(result_text)
+
+                    if qa_issues:
+                        # Issues found, add to TODO and go back to WIP
+                        issues_added = await self._handle_review_issues(qa_issues, "QA")
+                        if issues_added:
+                            continue  # Continue working on new issues
+
+                    # QA passed or skipped - transition to UAT (User Acceptance Testing)
+                    await self._set_project_status(
+                        ProjectStatus.UAT,
+                        "Reviews complete - ready for user acceptance testing"
+                    )
 
-                self._log_activity({
-                    "timestamp": datetime.now().isoformat(),
-                    "agent": "orchestrator",
-                    "action": f"Running {len(tasks)} task(s) in parallel",
-                    "details": ", ".join([t["text"][:30] + "..." for t in tasks])
-                })
+                    # Notify UI that UAT is ready
+                    self._send_message(
+                        "uat_ready",
+                        "All automated checks passed! Ready for User Acceptance Testing. Click 'Start UAT' to begin your review."
+                    )
+
+                    # Work pauses here - UAT is a user-driven conversation
+                    self._log_event("Awaiting UAT", "Project ready for user acceptance testing")
+                    break
+
+                self._log_event(
+                    f"Running {len(tasks)} task(s) in parallel",
+                    lambda ts=tasks: ", ".join(t["text"][:30] + "..." for t in ts)
+                )
 
                 # Batch small tasks by section to reduce CLI invocations
                 tasks = self._batch_tasks_by_section(tasks)
 
-                # Execute tasks in parallel
-                task_futures = [asyncio.create_task(self._execute_task(task)) for task in tasks]
-                self.active_tasks.update(task_futures)
-                results = await asyncio.gather(*task_futures, return_exceptions=True)
-                for t in task_futures:
-                    self.active_tasks.discard(t)
-
-                # Process results
-                for res in results:
-                    if isinstance(res, Exception):
-                        error_msg = str(res).encode('ascii', errors='replace').decode('ascii')
-                        self._log_activity({
-                            "timestamp": datetime.now().isoformat(),
-                            "agent": "orchestrator",
-                            "action": "Task exception",
-                            "details": error_msg[:200]
-                        })
-                        continue
+                # Execute tasks in parallel as plain tasks rather than a TaskGroup
+                # on purpose: one failing task must not cancel its siblings
+                # mid-run. Named tasks make stack dumps/profiles readable.
+                # Fetch memory context for the whole batch in one pass
+                contexts = self.memory.get_contexts_for_tasks(
+                    [(t.get("display_text", t["text"]), t["section"]) for t in tasks]
+                )
+                task_futures = [
+                    asyncio.create_task(self._execute_task(task, ctx), name=f"task:{task['text'][:40]}")
+                    for task, ctx in zip(tasks, contexts)
+                ]
+                for fut in task_futures:
+                    self.active_tasks.add(fut)
+                    fut.add_done_callback(self.active_tasks.discard)
+
+                # Process results as they arrive. Failures are escalated by a
+                # separate task, so waiting on the user doesn't hold up recording
+                # the results of slower siblings
+                failures: Deque[Tuple[Dict, str, str]] = deque()
+                escalation: Optional[asyncio.Task] = None
+                async with contextlib.aclosing(_iter_completed(task_futures)) as completed:
+                    async for fut in completed:
+                        if not self.is_working:
+                            # Stopped by the user via an escalation
+                            break
+                        if fut.cancelled():
+                            # Cancelled by force_stop; nothing to report
+                            continue
+                        exc = fut.exception()
+                        if exc is not None:
+                            error_msg = to_ascii(str(exc))
+                            self._log_event("Task exception", error_msg[:200])
+                            continue
+
+                        res = fut.result()
+                        task = res["task"]
+                        result = res["result"]
+
+                        if result["status"] == "complete":
+                            # Marked inside _execute_task to reduce UI lag
+                            pass
+                        elif result["status"] == "split":
+                            # Task was split into subtasks, will be picked up on next iteration
+                            self._log_event("Task split", "Subtasks added to TODO.md")
+                        elif result["status"] == "critical_error":
+                            # Critical error already sent to UI, stop work
+                            self.is_working = False
+                            break
+                        elif result["status"] in ("error", "timeout"):
+                            # Log the error
+                            error_msg = result.get("result", "Unknown error")
+                            agent = res.get("agent", "unknown")
+                            await self._log_error(
+                                error_type=result["status"],
+                                task=task["text"],
+                                error_details=error_msg,
+                                agent=agent
+                            )
 
-                    task = res["task"]
-                    result = res["result"]
-
-                    if result["status"] == "complete":
-                        # Marked inside _execute_task to reduce UI lag
-                        pass
-                    elif result["status"] == "split":
-                        # Task was split into subtasks, will be picked up on next iteration
-                        self._log_activity({
-                            "timestamp": datetime.now().isoformat(),
-                            "agent": "orchestrator",
-                            "action": "Task split",
-                            "details": "Subtasks added to TODO.md"
-                        })
-                    elif result["status"] == "critical_error":
-                        # Critical error already sent to UI, stop work
-                        self.is_working = False
-                        break
-                    elif result["status"] in ("error", "timeout"):
-                        # Log the error
-                        error_msg = result.get("result", "Unknown error")
-                        await self._log_error(
-                            error_type=result["status"],
-                            task=task["text"],
-                            error_details=error_msg,
-                            agent=res.get("agent", "unknown")
-                        )
+                            # Queue for the user's decision
+                            failures.append((task, error_msg, agent))
+                            if escalation is None or escalation.done():
+                                escalation = asyncio.create_task(
+                                    self._escalate_failures(failures, skipped_tasks),
+                                    name="escalate-failures"
+                                )
+                                self.active_tasks.add(escalation)
+                                escalation.add_done_callback(self.active_tasks.discard)
 
-                        # Escalate to user for decision
-                        action = await self._escalate_to_user(
-                            task=task["text"],
-                            error=error_msg,
-                            agent=res.get("agent", "unknown")
-                        )
+                if escalation is not None:
+                    if not self.is_working:
+                        # Nobody is left to act on a pending decision
+                        escalation.cancel()
+                    await asyncio.gather(escalation, return_exceptions=True)
 
-                        if action == TaskFailureAction.RETRY:
-                            # Don't add to skipped, will retry on next loop
-                            self._log_activity({
-                                "timestamp": datetime.now().isoformat(),
-                                "agent": "orchestrator",
-                                "action": "Retrying task",
-                                "details": task["text"][:100]
-                            })
-                        elif action == TaskFailureAction.SKIP:
-                            skipped_tasks.add(task["text"])
-                            await self._send_message("info", f"Skipped: {task['text'][:50]}...")
-                        elif action == TaskFailureAction.MODIFY_TASK:
-                            # Get a simpler version of the task
-                            new_task = await self._suggest_simpler_task(task["text"], error_msg)
-                            await self._modify_task_in_todo(task["text"], new_task)
-                            await self._send_message("info", f"Task modified to: {new_task[:50]}...")
-                        elif action == TaskFailureAction.REMOVE_TASK:
-                            await self._remove_task_from_todo(task["text"])
-                            await self._send_message("info", f"Removed task: {task['text'][:50]}...")
-                        elif action == TaskFailureAction.STOP_WORK:
-                            await self._send_message("work_paused", "Work stopped by user request")
-                            self.is_working = False
-                            break
+                # Let the rest of the batch finish (after a stop, their results are
+                # dropped) before the next scheduling pass
+                await asyncio.gather(*task_futures, return_exceptions=True)
+
+                # Persist this round's TODO edits before the next scheduling pass
+                await self.flush_todo()
 
                 # Check for pause request
                 if self.pause_requested:
-                    self._log_activity({
-                        "timestamp": datetime.now().isoformat(),
-                        "agent": "orchestrator",
-                        "action": "Work paused",
-                        "details": "Pause requested by user"
-                    })
-                    await self._send_message("work_paused", "Work paused. Click 'Start Work' to resume.")
+                    self._log_event("Work paused", "Pause requested by user")
+                    self._send_message("work_paused", "Work paused. Click 'Start Work' to resume.")
                     break
 
                 # Check for too many total failures
                 if self.total_failures >= self.max_task_retries * 3:
-                    await self._send_message(
+                    self._send_message(
                         "critical_error",
                         f"Too many failures ({self.total_failures}). Work stopped."
                     )
                     break
 
         except asyncio.CancelledError:
-            self._log_activity({
-                "timestamp": datetime.now().isoformat(),
-                "agent": "orchestrator",
-                "action": "Work force-stopped",
-                "details": "Cancelled by user"
-            })
-            await self._send_message("work_stopped", "Work force-stopped.")
+            self._log_event("Work force-stopped", "Cancelled by user")
+            self._send_message("work_stopped", "Work force-stopped.")
             return {"status": "stopped", "result": "Work force-stopped"}
         except Exception as e:
             # Critical error - send to UI
-            error_msg = str(e).encode('ascii', errors='replace').decode('ascii')
-            self._log_activity({
-                "timestamp": datetime.now().isoformat(),
-                "agent": "orchestrator",
-                "action": "Critical error",
-                "details": error_msg
-            })
-            await self._send_message("critical_error", f"Critical error: {error_msg}")
+            error_msg = to_ascii(str(e))
+            self._log_event("Critical error", error_msg)
+            self._send_message("critical_error", f"Critical error: {error_msg}")
 
         finally:
             self.is_working = False
             self.pause_requested = False
+            await self.flush_todo()
+            await self.flush_logs()
 
         return {"status": "complete", "result": "Work session ended"}
 
+    # One alternation regex per routing tier, tried in _AGENT_KEYWORD_RULES order
+    _AGENT_KEYWORD_RES = tuple(
+        (re.compile('|'.join(map(re.escape, keywords))), agent)
+        for agent, keywords in _AGENT_KEYWORD_RULES
+    )
+
     def _determine_agent_for_task(self, task_text: str) -> str:
         """Determine which agent should handle a task based on keywords.
 
@@ -1338,44 +1838,9 @@ If the project involves Python, ensure the TODO list includes, near the top, a t
         checked first, so they are handled with care or left to the default.
         """
         task_lower = task_text.lower()
-
-        # --- Narrow / high-confidence matches first ---
-
-        # QA tester: only explicit QA, verification, and regression work
-        if any(kw in task_lower for kw in ['qa review', 'qa test', 'regression test', 'verify requirements', 'acceptance test', 'end-to-end test', 'e2e test']):
-            return "qa_tester"
-
-        # Security reviewer: only audits/reviews, not implementation of auth features
-        if any(kw in task_lower for kw in ['security audit', 'security review', 'vulnerability', 'penetration test', 'security scan']):
-            return "security_reviewer"
-
-        # Testing agent: writing or running tests (unit, integration, etc.)
-        if any(kw in task_lower for kw in ['write test', 'create test', 'add test', 'update test', 'unit test', 'integration test', 'test suite', 'test case', 'run test', 'fix test']):
-            return "testing_agent"
-
-        # --- Medium-specificity matches ---
-
-        # UI/UX related
-        if any(kw in task_lower for kw in ['css', 'style', 'layout', 'frontend', 'html', 'template', 'responsive', 'navbar', 'sidebar', 'modal', 'theme']):
-            return "ui_ux_engineer"
-
-        # Database related (use specific DB terms, not broad words like 'model')
-        if any(kw in task_lower for kw in ['database', 'schema', 'sql', 'migration', 'table', 'query', 'index', 'foreign key', 'seed data']):
-            return "database_admin"
-
-        # --- Broad fallback matches ---
-
-        # 'test' alone (not caught above) -> testing_agent, not qa_tester
-        if 'test' in task_lower:
-            return "testing_agent"
-
-        # UI keywords that are broader
-        if any(kw in task_lower for kw in ['ui', 'ux', 'design', 'interface']):
-            return "ui_ux_engineer"
-
-        # DB broader match
-        if any(kw in task_lower for kw in ['db', 'model']):
-            return "database_admin"
+        for pattern, agent in self._AGENT_KEYWORD_RES:
+            if pattern.search(task_lower):
+                return agent
 
         # Default to software engineer — handles auth, implementation, and everything else
         return "software_engineer"
@@ -1386,102 +1851,99 @@ If the project involves Python, ensure the TODO list includes, near the top, a t
         task_text can be either the raw text (with {ID} and [depends:]) or display_text.
         We try the raw text first, then fall back to display_text matching.
         """
-        todo_path = os.path.join(self.project_path, "TODO.md")
-        if not os.path.exists(todo_path):
-            return
-
-        async with self.todo_lock:
-            async with aiofiles.open(todo_path, 'r', encoding='utf-8') as f:
-                content = await f.read()
-
-            # Try direct replacement first (works for raw text with {ID} and [depends:])
-            old_task = f"- [ ] {task_text}"
-            new_task = f"- [x] {task_text}"
-            if old_task in content:
-                content = content.replace(old_task, new_task, 1)
-            else:
-                # Fallback: find line containing display_text and check it off
-                lines = content.split('\n')
-                for i, line in enumerate(lines):
-                    stripped = line.strip()
-                    if stripped.startswith('- [ ] ') and task_text in stripped:
-                        lines[i] = line.replace('- [ ] ', '- [x] ', 1)
-                        break
-                content = '\n'.join(lines)
-
-            async with aiofiles.open(todo_path, 'w', encoding='utf-8') as f:
-                await f.write(content)
+        def edit(lines: List[str]) -> bool:
+            # Raw text (with {ID} and [depends:]) matches exactly; display_text
+            # falls back to the first unchecked line containing it
+            idx = self._locate_open_task(lines, task_text, fuzzy=True)
+            if idx is None:
+                return False
+            lines[idx] = lines[idx].replace('- [ ] ', '- [x] ', 1)
+            return True
 
-        self._log_activity({
-            "timestamp": datetime.now().isoformat(),
-            "agent": "orchestrator",
-            "action": "Task completed",
-            "details": task_text[:100]
-        })
+        if await self._edit_todo(edit) is None:
+            return
+        self._log_event("Task completed", task_text[:100])
 
     async def continue_work(self) -> Dict[str, Any]:
         """Continue working on the current project (alias for start_work)."""
         return await self.start_work()
 
+    def _scan_review_candidates(self, last_mtime: Optional[int]) -> Tuple[int, int, int, List[str]]:
+        """Walk the code files once for the final security review.
+
+        Returns (file count, newest mtime, number of files changed since
+        last_mtime, the first _MAX_REVIEW_FILES of those changed files).
+        Every file counts towards the change snapshot, but only the capped
+        candidate list is kept in memory.
+        """
+        latest_mtime = 0
+        file_count = 0
+        candidate_count = 0
+        files_to_review: List[str] = []
+        for rel_path, mtime in self._iter_code_files():
+            file_count += 1
+            if mtime > latest_mtime:
+                latest_mtime = mtime
+            # Incremental review: only files touched since the last review
+            if last_mtime is None or mtime > last_mtime:
+                candidate_count += 1
+                if len(files_to_review) < self._MAX_REVIEW_FILES:
+                    files_to_review.append(rel_path)
+        return file_count, latest_mtime, candidate_count, files_to_review
+
     async def _run_final_security_review(self) -> Dict[str, Any]:
         """Run a security review on all project files before completion."""
-        self._log_activity({
-            "timestamp": datetime.now().isoformat(),
-            "agent": "orchestrator",
-            "action": "Starting final security review",
-            "details": "Reviewing all project files for security issues"
-        })
+        self._log_event(
+            "Starting final security review",
+            "Reviewing all project files for security issues"
+        )
 
-        await self._send_message("info", "Running final security review...")
+        self._send_message("info", "Running final security review...")
 
-        # Collect all code files in the project
-        code_extensions = {'.py', '.js', '.ts', '.jsx', '.tsx', '.html', '.css', '.sql', '.sh', '.yml', '.yaml', '.json'}
-        exclude_dirs = {'.git', 'node_modules', '__pycache__', '.venv', 'venv', 'dist', 'build', 'QA'}
+        # The tree walk runs in a worker thread so large projects don't stall the loop
+        last_mtime = self._last_review_mtime
+        file_count, latest_mtime, candidate_count, files_to_review = await asyncio.to_thread(
+            self._scan_review_candidates, last_mtime
+        )
 
-        files_to_review = []
-        for root, dirs, files in os.walk(self.project_path):
-            # Skip excluded directories
-            dirs[:] = [d for d in dirs if d not in exclude_dirs]
-
-            for file in files:
-                ext = os.path.splitext(file)[1].lower()
-                if ext in code_extensions:
-                    file_path = os.path.join(root, file)
-                    rel_path = os.path.relpath(file_path, self.project_path)
-                    files_to_review.append(rel_path)
+        # Nothing changed since the last successful review - skip the LLM call
+        if (last_mtime is not None
+                and latest_mtime == last_mtime
+                and file_count == self._last_review_file_count):
+            self._log_event("Security review skipped", "No changes since last security review")
+            return {"status": "complete", "result": "Security review skipped (no changes)"}
+
+        if not files_to_review and file_count:
+            # Files were added/removed without newer mtimes (e.g. renames) - review from the top
+            candidate_count = file_count
+            files_to_review = [rel_path for rel_path, _ in itertools.islice(self._iter_code_files(), self._MAX_REVIEW_FILES)]
 
         if not files_to_review:
-            self._log_activity({
-                "timestamp": datetime.now().isoformat(),
-                "agent": "orchestrator",
-                "action": "Security review skipped",
-                "details": "No code files found to review"
-            })
+            self._log_event("Security review skipped", "No code files found to review")
             return {"status": "complete", "result": "No code files to review"}
 
         # Limit to reasonable number of files
-        if len(files_to_review) > 20:
-            files_to_review = files_to_review[:20]
-            self._log_activity({
-                "timestamp": datetime.now().isoformat(),
-                "agent": "orchestrator",
-                "action": "Security review",
-                "details": f"Reviewing first 20 files (total: {len(files_to_review)})"
-            })
+        if candidate_count > self._MAX_REVIEW_FILES:
+            self._log_event(
+                "Security review",
+                f"Reviewing first {self._MAX_REVIEW_FILES} files (total: {candidate_count})"
+            )
 
         try:
-            await self._notify_agent_start("security_reviewer")
+            self._notify_agent_start("security_reviewer")
             result = await self.request_security_review(files_to_review)
-            await self._notify_agent_complete("security_reviewer")
+            self._notify_agent_complete("security_reviewer")
 
             if result["status"] == "complete":
+                self._last_review_mtime = latest_mtime
+                self._last_review_file_count = file_count
                 self._log_activity({
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": time.time_ns(),
                     "agent": "security_reviewer",
                     "action": "Security review complete",
                     "details": result.get("result", "Review completed")[:500]
                 })
-                await self._send_message("info", "Security review completed")
+                self._send_message("info", "Security review completed")
 
                 # Add notes to QA notes file
                 await self._add_qa_notes(
@@ -1489,28 +1951,116 @@ If the project involves Python, ensure the TODO list includes, near the top, a t
                     "Security Review Notes"
                 )
             else:
-                self._log_activity({
-                    "timestamp": datetime.now().isoformat(),
-                    "agent": "orchestrator",
-                    "action": "Security review issue",
-                    "details": result.get("result", "Unknown issue")[:200]
-                })
+                self._log_event(
+                    "Security review issue",
+                    result.get("result", "Unknown issue")[:200]
+                )
 
             return result
 
         except Exception as e:
-            error_msg = str(e).encode('ascii', errors='replace').decode('ascii')
-            self._log_activity({
-                "timestamp": datetime.now().isoformat(),
-                "agent": "orchestrator",
-                "action": "Security review error",
-                "details": error_msg[:200]
-            })
-            await self._send_message("info", f"Security review encountered an error: {error_msg[:100]}")
+            error_msg = to_ascii(str(e))
+            self._log_event("Security review error", error_msg[:200])
+            self._send_message("info", f"Security review encountered an error: {error_msg[:100]}")
             return {"status": "error", "result": error_msg}
 
+    # Upper bound on files handed to the security reviewer in one pass
+    _MAX_REVIEW_FILES = 20
+
+    def _iter_code_files(self) -> Iterator[Tuple[str, int]]:
+        """Yield (relative path, st_mtime_ns) for every reviewable code file.
+
+        File mtimes are always re-read; the walk itself is _walk_code_paths.
+        """
+        for rel_path in self._walk_code_paths():
+            try:
+                yield rel_path, os.stat(os.path.join(self.project_path, rel_path)).st_mtime_ns
+            except OSError:
+                continue
+
+    def _walk_code_paths(self) -> Iterator[str]:
+        """Yield the relative path of every code file outside _EXCLUDE_DIRS.
+
+        Directory listings are cached by the directory's own mtime, which
+        changes whenever an entry is added, removed or renamed, so unchanged
+        directories are not re-listed. A walk stopped early keeps the old cache.
+        """
+        old_cache = self._scan_cache
+        new_cache: Dict[str, Tuple[int, List[str], List[str]]] = {}
+        # Listings of directories modified this recently are not trusted next
+        # time, since a same-tick change would not move the mtime
+        settled_before = time.time_ns() - 2_000_000_000
+
+        stack = [self.project_path]
+        while stack:
+            current = stack.pop()
+            try:
+                dir_mtime = os.stat(current).st_mtime_ns
+            except OSError:
+                continue
+            cached = old_cache.get(current)
+            if cached is None or cached[0] != dir_mtime:
+                cached = self._list_code_dir(current, dir_mtime)
+                if cached is None:
+                    continue
+            if dir_mtime < settled_before:
+                new_cache[current] = cached
+            stack.extend(cached[1])
+            yield from cached[2]
+
+        self._scan_cache = new_cache
+
+    def _list_code_dir(self, path: str, dir_mtime: int) -> Optional[Tuple[int, List[str], List[str]]]:
+        """List one directory as (mtime, subdirectories to walk, code files)."""
+        subdirs: List[str] = []
+        files: List[str] = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in _EXCLUDE_DIRS:
+                                subdirs.append(entry.path)
+                        elif entry.name.lower().endswith(_CODE_SUFFIXES):
+                            rel_path = os.path.relpath(entry.path, self.project_path)
+                            if rel_path not in _BOOKKEEPING_FILES:
+                                files.append(rel_path)
+                    except OSError:
+                        continue
+        except OSError:
+            return None
+        return dir_mtime, subdirs, files
+
+    # Number of distinct file sets whose review results are remembered
+    _SECURITY_REVIEW_CACHE_SIZE = 8
+
+    def _fingerprint_files(self, files: List[str]) -> frozenset:
+        """(relative path, sha256 of contents) for each file; "" if unreadable."""
+        fingerprints = []
+        for rel_path in files:
+            try:
+                with open(os.path.join(self.project_path, rel_path), 'rb') as f:
+                    digest = hashlib.sha256(f.read()).hexdigest()
+            except OSError:
+                digest = ""
+            fingerprints.append((rel_path, digest))
+        return frozenset(fingerprints)
+
     async def request_security_review(self, files: List[str]) -> Dict[str, Any]:
-        """Request a security review for specified files."""
+        """Request a security review for specified files.
+
+        A completed review is reused when the same files are asked for again
+        with byte-identical contents (e.g. rewritten but unchanged).
+        """
+        fingerprint = await asyncio.to_thread(self._fingerprint_files, files)
+        cached = self._security_review_cache.get(fingerprint)
+        if cached is not None:
+            self._log_event(
+                "Security review cache hit",
+                f"{len(files)} file(s) unchanged since their last review"
+            )
+            return dict(cached)
+
         reviewer = self.agents["security_reviewer"]
 
         review_task = f"""Please perform a security review of the following files:
@@ -1530,11 +2080,18 @@ Report any blocking issues that must be fixed before proceeding."""
             config=self.config
         )
 
+        if result.get("status") == "complete":
+            if len(self._security_review_cache) >= self._SECURITY_REVIEW_CACHE_SIZE:
+                # Dicts keep insertion order: drop the oldest entry
+                del self._security_review_cache[next(iter(self._security_review_cache))]
+            self._security_review_cache[fingerprint] = dict(result)
+
         return result
 
     def get_activity_log(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Get recent activity log entries."""
-        return self.activity_log[-limit:]
+        start = max(len(self.activity_log) - limit, 0)
+        return [a.to_dict() for a in itertools.islice(self.activity_log, start, None)]
 
     def get_status(self) -> Dict[str, Any]:
         """Get the current orchestrator status."""
@@ -1555,14 +2112,9 @@ Report any blocking issues that must be fixed before proceeding."""
             reason=reason
         )
 
-        self._log_activity({
-            "timestamp": datetime.now().isoformat(),
-            "agent": "orchestrator",
-            "action": f"Status changed to {status.value.upper()}",
-            "details": reason
-        })
+        self._log_event(f"Status changed to {status.value.upper()}", reason)
 
-        await self._send_message(
+        self._send_message(
             "status_change",
             f"Project status: {status.value}",
             new_status=status.value,
@@ -1580,74 +2132,57 @@ Report any blocking issues that must be fixed before proceeding."""
     def _should_run_testing_phase(self) -> bool:
         if not self.quality_gates.get("run_tests", True):
             return False
-        strategy = self._normalize_testing_strategy()
-        if strategy in {"minimal", "smoke", "smoke_tests", "smoke_test"}:
-            return False
-        return True
+        return self._testing_strategy_norm not in _SKIP_STRATEGIES
 
-    def _should_run_testing_phase_now(self) -> bool:
+    def _should_run_testing_phase_now(self, has_changes: Optional[bool] = None) -> bool:
         if not self._should_run_testing_phase():
             return False
-        return self._has_code_changes_since_last_review()
-
-    async def _run_tests(self) -> Dict[str, Any]:
-        """Run tests based on configured testing strategy."""
-        strategy = self._normalize_testing_strategy()
+        if has_changes is None:
+            has_changes = self._has_code_changes_since_last_review()
+        return has_changes
+
+    async def _run_tests(self, has_changes: Optional[bool] = None,
+                         latest_mtime: Optional[float] = None) -> Dict[str, Any]:
+        """Run tests based on configured testing strategy.
+
+        has_changes is the caller's _has_code_changes_since_last_review()
+        result; it is computed here when not given. latest_mtime is the
+        code mtime that result was based on, if the caller has it (see
+        _detect_pytests).
+        """
+        strategy = self._testing_strategy_norm
         if not self.quality_gates.get("run_tests", True):
             return {"status": "skipped", "summary": "Testing skipped (quality gate disabled)."}
 
         if strategy == "minimal":
-            self._log_activity({
-                "timestamp": datetime.now().isoformat(),
-                "agent": "orchestrator",
-                "action": "Tests skipped",
-                "details": "testing_strategy=minimal"
-            })
+            self._log_event("Tests skipped", "testing_strategy=minimal")
             return {"status": "skipped", "summary": "Testing skipped (strategy: minimal)."}
 
-        if strategy in {"critical_paths", "full_tdd"}:
-            if not self._has_code_changes_since_last_review():
+        if strategy in _TDD_STRATEGIES:
+            if has_changes is None:
+                has_changes = self._has_code_changes_since_last_review()
+            if not has_changes:
                 return {"status": "skipped", "summary": "Testing skipped (no code changes since last QA)."}
 
         languages = self._detect_project_languages()
-        tests_found = self._detect_tests_for_languages(languages)
+        tests_found = self._detect_tests_for_languages(languages, latest_mtime)
         if not tests_found:
             summary = f"No tests found (strategy: {strategy})."
             if strategy == "full_tdd":
-                self._log_activity({
-                    "timestamp": datetime.now().isoformat(),
-                    "agent": "orchestrator",
-                    "action": "Tests failed",
-                    "details": "No tests found for full_tdd"
-                })
+                self._log_event("Tests failed", "No tests found for full_tdd")
                 return {"status": "failed", "summary": summary}
 
-            self._log_activity({
-                "timestamp": datetime.now().isoformat(),
-                "agent": "orchestrator",
-                "action": "Tests skipped",
-                "details": summary
-            })
+            self._log_event("Tests skipped", summary)
             return {"status": "skipped", "summary": summary}
 
-        test_cmd = self._get_test_command(languages)
+        test_cmd = self._get_test_command(languages, latest_mtime)
         if not test_cmd:
             summary = "Tests found but no supported test runner detected."
-            self._log_activity({
-                "timestamp": datetime.now().isoformat(),
-                "agent": "orchestrator",
-                "action": "Tests error",
-                "details": summary
-            })
+            self._log_event("Tests error", summary)
             return {"status": "error", "summary": summary}
 
         cmd = test_cmd["cmd"]
-        self._log_activity({
-            "timestamp": datetime.now().isoformat(),
-            "agent": "orchestrator",
-            "action": "Running tests",
-            "details": test_cmd["label"]
-        })
+        self._log_event("Running tests", test_cmd["label"])
 
         process = None
         try:
@@ -1658,7 +2193,10 @@ Report any blocking issues that must be fixed before proceeding."""
                 stderr=asyncio.subprocess.PIPE
             )
             timeout = min(self.task_timeout, 300)
-            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+            stdout, stderr, _ = await asyncio.wait_for(
+                asyncio.gather(_read_capped(process.stdout), _read_capped(process.stderr), process.wait()),
+                timeout=timeout
+            )
 
             out = stdout.decode('utf-8', errors='replace').strip()
             err = stderr.decode('utf-8', errors='replace').strip()
@@ -1684,13 +2222,34 @@ Report any blocking issues that must be fixed before proceeding."""
         except Exception as e:
             return {"status": "error", "summary": f"Test runner error: {str(e)[:200]}"}
 
-    def _detect_pytests(self) -> bool:
-        """Detect if pytest-style tests exist in the project."""
+    def _detect_pytests(self, latest_mtime: Optional[float] = None) -> bool:
+        """Detect if pytest-style tests exist in the project.
+
+        When the caller passes the latest code mtime, the answer for the code
+        tree is reused until that mtime moves (or the quality marker is
+        saved). Without it, the tree is walked only up to the first test module.
+        """
         languages = self._detect_project_languages()
         if "python" not in languages:
             return False
-        for root, dirs, files in os.walk(self.project_path):
-            dirs[:] = [d for d in dirs if d not in {".git", ".venv", "venv", "__pycache__", "node_modules", "dist", "build"}]
+        cached = self._tests_detected_cache
+        if latest_mtime is not None and cached is not None and cached[0] == latest_mtime:
+            found = cached[1]
+        else:
+            # Stops at the first test module; no per-file stat() is needed
+            found = any(
+                os.path.basename(rel_path).startswith("test_") and rel_path.endswith(".py")
+                for rel_path in self._walk_code_paths()
+            )
+            if latest_mtime is not None:
+                self._tests_detected_cache = (latest_mtime, found)
+        # QA/ is outside the code walk (and so the mtime), so it is checked every time
+        return found or self._detect_qa_pytests()
+
+    def _detect_qa_pytests(self) -> bool:
+        """Detect pytest-style tests kept under the project's QA folder."""
+        for root, dirs, files in os.walk(os.path.join(self.project_path, "QA")):
+            dirs[:] = [d for d in dirs if d not in _EXCLUDE_DIRS]
             for name in files:
                 if name.startswith("test_") and name.endswith(".py"):
                     return True
@@ -1698,27 +2257,15 @@ Report any blocking issues that must be fixed before proceeding."""
 
     def _detect_project_languages(self) -> Set[str]:
         """Detect project languages based on common config files and file extensions."""
-        root = self.project_path
         languages: Set[str] = set()
+        # One directory listing instead of a stat() per marker file
+        names = set(os.listdir(self.project_path))
 
-        if os.path.exists(os.path.join(root, "pyproject.toml")) or os.path.exists(os.path.join(root, "requirements.txt")):
-            languages.add("python")
-        if os.path.exists(os.path.join(root, "setup.py")) or os.path.exists(os.path.join(root, "setup.cfg")):
-            languages.add("python")
-        if os.path.exists(os.path.join(root, "package.json")):
-            languages.add("node")
-        if os.path.exists(os.path.join(root, "go.mod")):
-            languages.add("go")
-        if os.path.exists(os.path.join(root, "Cargo.toml")):
-            languages.add("rust")
-        if os.path.exists(os.path.join(root, "pom.xml")) or os.path.exists(os.path.join(root, "build.gradle")) or os.path.exists(os.path.join(root, "build.gradle.kts")):
-            languages.add("java")
-        if any(name.endswith(".csproj") or name.endswith(".sln") for name in os.listdir(root)):
+        for language, markers in _LANGUAGE_MARKER_FILES:
+            if not names.isdisjoint(markers):
+                languages.add(language)
+        if any(name.endswith((".csproj", ".sln")) for name in names):
             languages.add("dotnet")
-        if os.path.exists(os.path.join(root, "Gemfile")):
-            languages.add("ruby")
-        if os.path.exists(os.path.join(root, "composer.json")):
-            languages.add("php")
 
         if not languages:
             languages = self._detect_languages_by_extension()
@@ -1740,13 +2287,12 @@ Report any blocking issues that must be fixed before proceeding."""
             ".rb": "ruby",
             ".php": "php",
         }
-        exclude_dirs = {".git", ".venv", "venv", "__pycache__", "node_modules", "dist", "build", "QA"}
         roots = [self.project_path, os.path.join(self.project_path, "src")]
         for base in roots:
             if not os.path.exists(base):
                 continue
             for root, dirs, files in os.walk(base):
-                dirs[:] = [d for d in dirs if d not in exclude_dirs]
+                dirs[:] = [d for d in dirs if d not in _EXCLUDE_DIRS]
                 for name in files:
                     ext = os.path.splitext(name)[1].lower()
                     lang = ext_map.get(ext)
@@ -1756,8 +2302,8 @@ Report any blocking issues that must be fixed before proceeding."""
                     return languages
         return languages
 
-    def _detect_tests_for_languages(self, languages: Set[str]) -> bool:
-        if "python" in languages and self._detect_pytests():
+    def _detect_tests_for_languages(self, languages: Set[str], latest_mtime: Optional[float] = None) -> bool:
+        if "python" in languages and self._detect_pytests(latest_mtime):
             return True
         if "node" in languages and self._detect_node_tests():
             return True
@@ -1779,9 +2325,8 @@ Report any blocking issues that must be fixed before proceeding."""
             if os.path.exists(os.path.join(self.project_path, d)):
                 return True
         patterns = (".test.js", ".spec.js", ".test.jsx", ".spec.jsx", ".test.ts", ".spec.ts", ".test.tsx", ".spec.tsx")
-        exclude_dirs = {".git", ".venv", "venv", "__pycache__", "node_modules", "dist", "build", "QA"}
         for root, dirs, files in os.walk(self.project_path):
-            dirs[:] = [d for d in dirs if d not in exclude_dirs]
+            dirs[:] = [d for d in dirs if d not in _EXCLUDE_DIRS]
             for name in files:
                 lower = name.lower()
                 if lower.endswith(patterns):
@@ -1791,9 +2336,8 @@ Report any blocking issues that must be fixed before proceeding."""
     def _detect_go_tests(self) -> bool:
         if not os.path.exists(os.path.join(self.project_path, "go.mod")):
             return False
-        exclude_dirs = {".git", ".venv", "venv", "__pycache__", "node_modules", "dist", "build", "QA"}
         for root, dirs, files in os.walk(self.project_path):
-            dirs[:] = [d for d in dirs if d not in exclude_dirs]
+            dirs[:] = [d for d in dirs if d not in _EXCLUDE_DIRS]
             for name in files:
                 if name.endswith("_test.go"):
                     return True
@@ -1825,8 +2369,8 @@ Report any blocking issues that must be fixed before proceeding."""
             return True
         return False
 
-    def _get_test_command(self, languages: Set[str]) -> Optional[Dict[str, Any]]:
-        if "python" in languages and self._detect_pytests():
+    def _get_test_command(self, languages: Set[str], latest_mtime: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        if "python" in languages and self._detect_pytests(latest_mtime):
             return {"cmd": ["pytest", "-q"], "label": "pytest -q"}
         if "node" in languages and self._detect_node_tests():
             return {"cmd": ["npm", "test"], "label": "npm test"}
@@ -1846,24 +2390,17 @@ Report any blocking issues that must be fixed before proceeding."""
         return os.path.join(self.project_path, ".quality_gate.json")
 
     def _get_latest_code_mtime(self) -> float:
-        code_extensions = {'.py', '.js', '.ts', '.jsx', '.tsx', '.html', '.css', '.sql', '.sh', '.yml', '.yaml', '.json'}
-        exclude_dirs = {'.git', 'node_modules', '__pycache__', '.venv', 'venv', 'dist', 'build', 'QA'}
-        latest = 0.0
-        for root, dirs, files in os.walk(self.project_path):
-            dirs[:] = [d for d in dirs if d not in exclude_dirs]
-            for file in files:
-                ext = os.path.splitext(file)[1].lower()
-                if ext in code_extensions:
-                    try:
-                        mtime = os.path.getmtime(os.path.join(root, file))
-                        if mtime > latest:
-                            latest = mtime
-                    except OSError:
-                        continue
-        return latest
+        """Newest code-file mtime in seconds, or 0.0 if there are no code files.
 
-    def _has_code_changes_since_last_review(self) -> bool:
-        latest = self._get_latest_code_mtime()
+        Uses the same cached walk as the security review, which also leaves
+        out the workflow's own bookkeeping files (STATUS.json and the
+        quality marker) so saving them is not mistaken for a code change.
+        """
+        latest_ns = max((mtime for _, mtime in self._iter_code_files()), default=0)
+        return latest_ns / 1e9
+
+    def _has_code_changes_since_last_review(self, latest_mtime: Optional[float] = None) -> bool:
+        latest = self._get_latest_code_mtime() if latest_mtime is None else latest_mtime
         if latest == 0.0:
             return False
         marker_path = self._quality_marker_path()
@@ -1877,28 +2414,43 @@ Report any blocking issues that must be fixed before proceeding."""
         except Exception:
             return True
 
-    def _save_quality_marker(self):
+    def _save_quality_marker(self, latest_mtime: Optional[float] = None):
+        """Record the code mtime the quality gates passed at.
+
+        latest_mtime is the mtime the gates were run against; code changed
+        since then is then reviewed again next time.
+        """
         marker_path = self._quality_marker_path()
+        self._tests_detected_cache = None
+        if latest_mtime is None:
+            latest_mtime = self._get_latest_code_mtime()
         data = {
-            "last_code_mtime": self._get_latest_code_mtime(),
+            "last_code_mtime": latest_mtime,
             "timestamp": datetime.now().isoformat()
         }
+        # Written to a temp file and swapped in, so a crash mid-write can't
+        # leave a truncated marker behind
+        tmp_path = f"{marker_path}.tmp"
         try:
-            with open(marker_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
-        except Exception:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(json.dumps(data, separators=(",", ":")))
+            os.replace(tmp_path, marker_path)
+        except OSError:
             pass
 
-    async def _ensure_tests_exist(self, allow_update: bool = False) -> Dict[str, Any]:
-        """Ask the Testing Agent to create or update minimal tests as needed."""
-        languages = self._detect_project_languages()
-        tests_exist = self._detect_tests_for_languages(languages)
+    async def _ensure_tests_exist(self, allow_update: bool = False,
+                                  latest_mtime: Optional[float] = None) -> Dict[str, Any]:
+        """Ask the Testing Agent to create or update minimal tests as needed.
 
-        if tests_exist and not allow_update:
+        latest_mtime is passed on to the test detection (see _detect_pytests).
+        """
+        languages = self._detect_project_languages()
+        # With allow_update the agent runs either way, so there is nothing to detect
+        if not allow_update and self._detect_tests_for_languages(languages, latest_mtime):
             return {"status": "skipped", "result": "Tests already exist; update not required."}
 
         try:
-            await self._notify_agent_start("testing_agent")
+            self._notify_agent_start("testing_agent")
 
             languages = sorted(languages)
             language_hint = ", ".join(languages) if languages else "unknown"
@@ -1928,29 +2480,35 @@ Requirements:
         except Exception:
             return {"status": "error", "result": "Testing agent failed to create/update tests."}
         finally:
-            await self._notify_agent_complete("testing_agent")
+            # The agent may have added tests without moving latest_mtime
+            self._tests_detected_cache = None
+            self._notify_agent_complete("testing_agent")
 
-    async def _run_testing_phase(self) -> Dict[str, Any]:
-        """Run the dedicated testing phase before security review."""
+    async def _run_testing_phase(self, has_changes: Optional[bool] = None,
+                                 latest_mtime: Optional[float] = None) -> Dict[str, Any]:
+        """Run the dedicated testing phase before security review.
+
+        has_changes and latest_mtime are passed on to _run_tests (see there).
+        """
         if not self._should_run_testing_phase():
             return {"status": "skipped", "result": "Testing phase skipped (strategy <= smoke or gate disabled)."}
-        if not self._has_code_changes_since_last_review():
+        if has_changes is None:
+            has_changes = self._has_code_changes_since_last_review()
+        if not has_changes:
             return {"status": "skipped", "result": "Testing phase skipped (no code changes since last QA)."}
 
-        self._log_activity({
-            "timestamp": datetime.now().isoformat(),
-            "agent": "orchestrator",
-            "action": "Starting testing phase",
-            "details": f"Testing strategy: {self._normalize_testing_strategy()}"
-        })
+        self._log_event(
+            "Starting testing phase",
+            f"Testing strategy: {self._testing_strategy_norm}"
+        )
 
-        await self._send_message("info", "Running testing phase...")
+        self._send_message("info", "Running testing phase...")
 
         # Build or update tests
-        prep_result = await self._ensure_tests_exist(allow_update=True)
+        prep_result = await self._ensure_tests_exist(allow_update=True, latest_mtime=latest_mtime)
 
         # Run tests
-        test_result = await self._run_tests()
+        test_result = await self._run_tests(has_changes, latest_mtime)
         self.last_test_result = test_result
 
         issues = []
@@ -1974,32 +2532,29 @@ Requirements:
             "test_result": test_result
         }
 
-    async def _run_qa_review(self) -> Dict[str, Any]:
-        """Run QA testing on the project."""
+    async def _run_qa_review(self, has_changes: Optional[bool] = None) -> Dict[str, Any]:
+        """Run QA testing on the project.
+
+        has_changes is the caller's _has_code_changes_since_last_review()
+        result; it is computed here when not given.
+        """
         if not self.quality_gates.get("run_qa_review", True):
             return {"status": "skipped", "result": "QA review skipped (quality gate disabled)."}
-        if not self._has_code_changes_since_last_review():
+        if has_changes is None:
+            has_changes = self._has_code_changes_since_last_review()
+        if not has_changes:
             return {"status": "skipped", "result": "QA review skipped (no code changes since last QA)."}
 
         await self._ensure_runit_md()
 
-        self._log_activity({
-            "timestamp": datetime.now().isoformat(),
-            "agent": "orchestrator",
-            "action": "Starting QA review",
-            "details": f"Playwright available: {self.playwright_available}"
-        })
+        self._log_event("Starting QA review", f"Playwright available: {self.playwright_available}")
 
-        await self._send_message("info", "Running QA review...")
+        self._send_message("info", "Running QA review...")
 
         test_result = self.last_test_result or {"summary": "No automated tests were run in QA phase."}
 
         # Read spec for requirements verification
-        spec_content = ""
-        spec_path = os.path.join(self.project_path, "SPEC.md")
-        if os.path.exists(spec_path):
-            with open(spec_path, 'r', encoding='utf-8') as f:
-                spec_content = f.read()
+        spec_content = await self._read_spec()
 
         # Build QA task
         mgmt_port = self.config.get("server_port", 8080)
@@ -2050,7 +2605,7 @@ If all tests pass, report "QA PASSED" with a summary of what was tested.
 If issues are found, report them in the format above so they can be added to TODO."""
 
         try:
-            await self._notify_agent_start("qa_tester")
+            self._notify_agent_start("qa_tester")
 
             qa_agent = self.agents["qa_tester"]
             result = await qa_agent.process_task(
@@ -2062,48 +2617,73 @@ If issues are found, report them in the format above so they can be added to TOD
                 config=self.config
             )
 
-            await self._notify_agent_complete("qa_tester")
+            self._notify_agent_complete("qa_tester")
 
             return result
 
         except Exception as e:
-            await self._notify_agent_complete("qa_tester")
-            error_msg = str(e).encode('ascii', errors='replace').decode('ascii')
+            self._notify_agent_complete("qa_tester")
+            error_msg = to_ascii(str(e))
             return {"status": "error", "result": error_msg}
 
+    # Matches only the lines that change parser state: a BLOCKING:/MAJOR:
+    # marker anywhere in the line (which takes precedence), or a line
+    # starting with an optional "- " and a title/description/severity field
+    _REVIEW_LINE_RE = re.compile(
+        r'^(?:'
+        r'(?=.*(?:blocking|major):).*'
+        r'|[^\S\n]*(?:- )?(?P<field>title|description|severity):(?P<value>.*)'
+        r')$', re.IGNORECASE | re.MULTILINE
+    )
+
+    # Upper bound on distinct issues taken from one review
+    _MAX_REVIEW_ISSUES = 50
+
     def _parse_review_issues(self, review_result: str) -> List[Dict[str, str]]:
-        """Parse issues from security or QA review results."""
-        issues = []
-        lines = review_result.split('\n')
+        """Parse issues from security or QA review results.
+
+        Lines are scanned lazily, repeated titles are kept once (first wins),
+        and scanning stops after _MAX_REVIEW_ISSUES distinct issues.
+        """
+        issues: Dict[str, Dict[str, str]] = {}
 
         current_issue = {}
-        for line in lines:
-            line_lower = line.lower().strip()
+        for m in self._REVIEW_LINE_RE.finditer(review_result):
+            if len(issues) >= self._MAX_REVIEW_ISSUES:
+                current_issue = {}
+                break
+            field = m.group('field')
 
             # Look for issue markers
-            if 'blocking:' in line_lower or 'major:' in line_lower:
+            if field is None:
+                line = m.group(0)
                 if current_issue:
-                    issues.append(current_issue)
-                severity = "BLOCKING" if "blocking" in line_lower else "MAJOR"
-                title = line.split(':', 1)[-1].strip() if ':' in line else line.strip()
-                current_issue = {"title": f"[{severity}] {title}", "description": ""}
+                    issues.setdefault(current_issue["title"], current_issue)
+                severity = "BLOCKING" if "blocking" in line.lower() else "MAJOR"
+                current_issue = {"title": f"[{severity}] {line.split(':', 1)[1].strip()}", "description": ""}
+                continue
 
-            elif line_lower.startswith('- title:') or line_lower.startswith('title:'):
+            field = field.lower()
+            value = m.group('value').strip()
+            if field == 'title':
+                # A titled issue is finished; severity seen before any title
+                # stays with the issue this line starts
                 if current_issue and current_issue.get("title"):
-                    issues.append(current_issue)
-                title = line.split(':', 1)[-1].strip()
+                    issues.setdefault(current_issue["title"], current_issue)
+                    current_issue = {}
+                title = value
                 current_issue = current_issue or {"title": "", "description": ""}
                 current_issue["title"] = title
                 severity = current_issue.get("severity", "")
                 if severity in ("BLOCKING", "MAJOR") and not title.upper().startswith(f"[{severity}]"):
                     current_issue["title"] = f"[{severity}] {title}".strip()
 
-            elif line_lower.startswith('- description:') or line_lower.startswith('description:'):
+            elif field == 'description':
                 if current_issue:
-                    current_issue["description"] = line.split(':', 1)[-1].strip()
+                    current_issue["description"] = value
 
-            elif line_lower.startswith('- severity:') or line_lower.startswith('severity:'):
-                severity = line.split(':', 1)[-1].strip().upper()
+            else:
+                severity = value.upper()
                 if not current_issue:
                     current_issue = {"title": "", "description": ""}
                 current_issue["severity"] = severity
@@ -2112,9 +2692,9 @@ If issues are found, report them in the format above so they can be added to TOD
                         current_issue["title"] = f"[{severity}] {current_issue.get('title', '')}".strip()
 
         if current_issue and current_issue.get("title"):
-            issues.append(current_issue)
+            issues.setdefault(current_issue["title"], current_issue)
 
-        return issues
+        return list(issues.values())
 
     async def _ensure_runit_md(self) -> Dict[str, Any]:
         """Ensure runit.md exists before QA/UAT to help manual testing."""
@@ -2122,12 +2702,7 @@ If issues are found, report them in the format above so they can be added to TOD
         if os.path.exists(runit_path):
             return {"status": "skipped", "result": "runit.md already exists."}
 
-        self._log_activity({
-            "timestamp": datetime.now().isoformat(),
-            "agent": "orchestrator",
-            "action": "Generating runit.md",
-            "details": "Preparing run instructions before QA"
-        })
+        self._log_event("Generating runit.md", "Preparing run instructions before QA")
 
         prompt = """Create a file named runit.md in this project with clear instructions on how to build and run this project.
 
@@ -2141,7 +2716,7 @@ If details are unknown, note reasonable assumptions and how to verify. Keep it c
 Write the runit.md file now.
 """
         try:
-            await self._notify_agent_start("project_manager")
+            self._notify_agent_start("project_manager")
             result = await self.agents["project_manager"].process_task(
                 task=prompt,
                 project_path=self.project_path,
@@ -2154,7 +2729,7 @@ Write the runit.md file now.
         except Exception:
             return {"status": "error", "result": "Failed to generate runit.md."}
         finally:
-            await self._notify_agent_complete("project_manager")
+            self._notify_agent_complete("project_manager")
 
     async def _handle_review_issues(
         self,
@@ -2168,8 +2743,10 @@ Write the runit.md file now.
         if not issues:
             return False
 
-        # Add issues to TODO
-        self.project_manager_core.add_review_issues_to_todo(
+        # Add issues to TODO (flush pending edits first so they aren't clobbered)
+        await self.flush_todo()
+        await asyncio.to_thread(
+            self.project_manager_core.add_review_issues_to_todo,
             name=self.project_name,
             issues=issues,
             review_type=review_type
@@ -2182,23 +2759,22 @@ Write the runit.md file now.
         )
 
         # Notify UI
-        await self._send_message(
+        self._send_message(
             "info",
             f"{review_type} found {len(issues)} issues. Added to TODO. Status reset to WIP."
         )
 
-        self._log_activity({
-            "timestamp": datetime.now().isoformat(),
-            "agent": "orchestrator",
-            "action": f"{review_type} issues added to TODO",
-            "details": f"{len(issues)} issues need to be addressed"
-        })
+        self._log_event(
+            f"{review_type} issues added to TODO",
+            f"{len(issues)} issues need to be addressed"
+        )
 
         return True
 
     async def _add_qa_notes(self, notes: str, section: str = "QA Review Notes"):
         """Add notes to the QA notes.md file."""
-        self.project_manager_core.append_qa_notes(
+        await asyncio.to_thread(
+            self.project_manager_core.append_qa_notes,
             name=self.project_name,
             notes=notes,
             section=section,
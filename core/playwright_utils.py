@@ -4,10 +4,16 @@ import os
 import json
 import subprocess
 import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, Any, Optional, List
 from pathlib import Path
 
+# Detection results shared across processes; see PlaywrightManager._detect_playwright
+DETECT_CACHE_PATH = Path.home() / ".cache" / "simple_agentic" / "playwright_detect.json"
+DEFAULT_DETECT_CACHE_TTL_SECONDS = 3600
+
 
 class PlaywrightManager:
     """
@@ -51,14 +57,14 @@ class PlaywrightManager:
             return self._availability_cache
 
         if self.should_auto_detect():
-            self._availability_cache = self._detect_playwright()
+            self._availability_cache = self._detect_playwright(use_cache=not force_check)
         else:
             # If auto-detect is off, assume it's available if enabled
             self._availability_cache = True
 
         return self._availability_cache
 
-    def _detect_playwright(self) -> bool:
+    def _detect_playwright(self, use_cache: bool = True) -> bool:
         """
         Detect if Playwright MCP server is available in Claude CLI.
 
@@ -67,9 +73,67 @@ class PlaywrightManager:
         2. Playwright npm package installation
         3. Environment variables for Playwright config
 
+        The result is stored in DETECT_CACHE_PATH and reused by any process
+        for playwright.detect_cache_ttl_seconds (0 disables the cache), as
+        long as the inputs it depends on (see _detect_cache_context) match.
+
+        Args:
+            use_cache: Accept a fresh cached result instead of probing
+
         Returns:
             True if Playwright is detected and available
         """
+        try:
+            ttl = float(self.playwright_config.get("detect_cache_ttl_seconds", DEFAULT_DETECT_CACHE_TTL_SECONDS))
+        except (TypeError, ValueError):
+            ttl = DEFAULT_DETECT_CACHE_TTL_SECONDS
+        context = self._detect_cache_context()
+        if use_cache and ttl > 0:
+            cached = self._read_detect_cache(ttl, context)
+            if cached is not None:
+                return cached
+
+        available = self._run_detection_checks()
+        if ttl > 0:
+            self._write_detect_cache(available, context)
+        return available
+
+    def _detect_cache_context(self) -> Dict[str, Any]:
+        """Inputs besides the user's config files that the detection result depends on."""
+        return {
+            "cwd": os.getcwd(),
+            "node_path": os.environ.get("NODE_PATH", ""),
+            "env_available": os.environ.get("PLAYWRIGHT_AVAILABLE", ""),
+            "npm_list_fallback": bool(self.playwright_config.get("npm_list_fallback", False)),
+        }
+
+    def _read_detect_cache(self, ttl: float, context: Dict[str, Any]) -> Optional[bool]:
+        """Return the cached result if it is younger than ttl seconds and was made in the same context."""
+        try:
+            with open(DETECT_CACHE_PATH, 'r') as f:
+                cached = json.load(f)
+            if cached.get("context") == context and time.time() - float(cached["ts"]) < ttl:
+                return bool(cached["available"])
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            pass
+        return None
+
+    def _write_detect_cache(self, available: bool, context: Dict[str, Any]):
+        """Atomically replace the detection cache file (best effort)."""
+        tmp_path = DETECT_CACHE_PATH.with_name(f"{DETECT_CACHE_PATH.name}.{os.getpid()}.tmp")
+        try:
+            DETECT_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w') as f:
+                json.dump({"ts": time.time(), "available": available, "context": context}, f)
+            os.replace(tmp_path, DETECT_CACHE_PATH)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def _run_detection_checks(self) -> bool:
+        """Run the detection checks without consulting the cache."""
         # Check 1: Look for Claude CLI MCP config
         if self._check_claude_mcp_config():
             return True
@@ -126,33 +190,46 @@ class PlaywrightManager:
         return False
 
     def _check_npm_playwright(self) -> bool:
-        """Check if Playwright is installed via npm."""
-        try:
-            result = subprocess.run(
-                ["npm", "list", "@anthropic/mcp-server-playwright", "--depth=0"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            if "@anthropic/mcp-server-playwright" in result.stdout:
-                return True
-        except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
-            pass
+        """Check if Playwright is installed via npm.
+
+        Looks for the packages' package.json under node_modules in the
+        working directory, the home directory and each NODE_PATH entry.
+        Running `npm list` as well is opt-in (playwright.npm_list_fallback),
+        since every probe starts a Node.js process.
+        """
+        module_dirs = [Path.cwd() / "node_modules", Path.home() / "node_modules"]
+        # NODE_PATH entries are node_modules directories themselves
+        module_dirs.extend(Path(p) for p in os.environ.get("NODE_PATH", "").split(os.pathsep) if p)
+        for module_dir in module_dirs:
+            for package in ("@anthropic/mcp-server-playwright", "playwright"):
+                if (module_dir / package / "package.json").is_file():
+                    return True
+
+        if not self.playwright_config.get("npm_list_fallback", False):
+            return False
+
+        # Both probes run at once so their timeouts overlap
+        probes = [
+            ("@anthropic/mcp-server-playwright", "@anthropic/mcp-server-playwright"),
+            # Also check for regular playwright
+            ("playwright", "playwright@"),
+        ]
+        with ThreadPoolExecutor(max_workers=len(probes)) as pool:
+            results = list(pool.map(lambda probe: self._npm_list_contains(*probe), probes))
+        return any(results)
 
-        # Also check for regular playwright
+    def _npm_list_contains(self, package: str, marker: str) -> bool:
+        """Run `npm list <package>` and look for marker in its output."""
         try:
             result = subprocess.run(
-                ["npm", "list", "playwright", "--depth=0"],
+                ["npm", "list", package, "--depth=0"],
                 capture_output=True,
                 text=True,
                 timeout=10
             )
-            if "playwright@" in result.stdout:
-                return True
+            return marker in result.stdout
         except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
-            pass
-
-        return False
+            return False
 
     def get_screenshot_path(self, project_path: str, name: str = None) -> str:
         """
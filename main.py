@@ -45,6 +45,10 @@ server_port = config.get("server_port", 8080)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown events."""
+    # Python 3.12+: run new tasks eagerly so short helpers that finish
+    # without suspending skip the run queue
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
     print("Agentic Software Team starting up...")
     print(f"Open http://localhost:{server_port} in your browser")
     yield
@@ -85,10 +89,14 @@ class StatusUpdateRequest(BaseModel):
 # WebSocket connection manager
 async def broadcast_message(message: Dict[str, Any]):
     """Broadcast a message to all connected WebSocket clients."""
+    if not websocket_connections:
+        return
+    # Encode once for every client (same encoding as WebSocket.send_json)
+    payload = json.dumps(message, separators=(",", ":"), ensure_ascii=False)
     disconnected = []
     for websocket in websocket_connections:
         try:
-            await websocket.send_json(message)
+            await websocket.send_text(payload)
         except Exception:
             disconnected.append(websocket)
 
@@ -98,12 +106,44 @@ async def broadcast_message(message: Dict[str, Any]):
             websocket_connections.remove(ws)
 
 
+# Activities logged within this many seconds of each other share one frame
+ACTIVITY_BATCH_WINDOW = 0.05
+
+
 def create_activity_callback(project_name: str):
-    """Create an activity callback for a specific project."""
-    def callback(activity: Dict[str, Any]):
-        activity["project"] = project_name
-        activity["type"] = "activity"
-        asyncio.create_task(broadcast_message(activity))
+    """Create an activity callback for a specific project.
+
+    Activities are collected for ACTIVITY_BATCH_WINDOW seconds and broadcast
+    together as one {"type": "batch"} frame (a lone activity is sent as-is).
+    The orchestrator passes Activity records, which are only turned into
+    dicts here when the frame is built; conversation managers pass dicts.
+    """
+    pending: List[Any] = []
+    flush_task: Optional[asyncio.Task] = None
+
+    async def flush():
+        # Activities logged while a frame is being sent go out in the next
+        # pass, so nothing is left waiting once this task finishes
+        while pending:
+            await asyncio.sleep(ACTIVITY_BATCH_WINDOW)
+            batch = []
+            for activity in pending:
+                if hasattr(activity, "to_dict"):
+                    activity = activity.to_dict()
+                activity["project"] = project_name
+                activity["type"] = "activity"
+                batch.append(activity)
+            pending.clear()
+            if len(batch) == 1:
+                await broadcast_message(batch[0])
+            else:
+                await broadcast_message({"type": "batch", "project": project_name, "messages": batch})
+
+    def callback(activity: Any):
+        nonlocal flush_task
+        pending.append(activity)
+        if flush_task is None or flush_task.done():
+            flush_task = asyncio.create_task(flush())
     return callback
 
 
@@ -182,6 +222,10 @@ async def get_project_todo(name: str):
     if not project_path:
         raise HTTPException(status_code=404, detail="Project not found")
 
+    # A running orchestrator buffers TODO edits briefly; write them out first
+    if name in active_orchestrators:
+        await active_orchestrators[name].flush_todo()
+
     todo_path = os.path.join(project_path, "TODO.md")
     if os.path.exists(todo_path):
         with open(todo_path, 'r', encoding='utf-8') as f:
@@ -784,12 +828,34 @@ async def get_config():
 async def update_config(new_config: Dict[str, Any]):
     """Update configuration."""
     global config
+    # Validate before anything is saved, so a bad value is never persisted
+    execution = new_config.get("execution")
+    max_concurrent = execution.get("max_concurrent_agents") if isinstance(execution, dict) else None
+    if max_concurrent is not None:
+        try:
+            if isinstance(max_concurrent, bool):
+                raise ValueError
+            max_concurrent = int(max_concurrent)
+        except (TypeError, ValueError):
+            max_concurrent = 0
+        if max_concurrent < 1:
+            raise HTTPException(
+                status_code=400,
+                detail="execution.max_concurrent_agents must be an integer of at least 1"
+            )
+        execution["max_concurrent_agents"] = max_concurrent
+
     config.update(new_config)
 
     # Save to file
     with open(config_path, 'w') as f:
         json.dump(config, f, indent=2)
 
+    # Apply a new concurrency limit to running orchestrators without a restart
+    if max_concurrent is not None:
+        for orchestrator in active_orchestrators.values():
+            await orchestrator.set_max_concurrent(max_concurrent)
+
     return {"status": "updated", "config": config}
 
 
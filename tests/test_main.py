@@ -0,0 +1,31 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+import main  # noqa: E402
+
+
+def test_activity_burst_is_fully_delivered(monkeypatch):
+    frames = []
+    callback = main.create_activity_callback("demo")
+
+    async def fake_broadcast(message):
+        frames.append(message)
+        # Activities logged while a frame is being sent must not be stranded
+        if len(frames) == 1:
+            callback({"action": "logged during send"})
+        await asyncio.sleep(0)
+
+    monkeypatch.setattr(main, "broadcast_message", fake_broadcast)
+
+    async def run():
+        for i in range(5):
+            callback({"action": f"step {i}"})
+        await asyncio.sleep(main.ACTIVITY_BATCH_WINDOW * 4)
+
+    asyncio.run(run())
+    assert frames[0]["type"] == "batch"
+    assert [a["action"] for a in frames[0]["messages"]] == [f"step {i}" for i in range(5)]
+    assert frames[1] == {"action": "logged during send", "project": "demo", "type": "activity"}
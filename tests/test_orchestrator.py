@@ -0,0 +1,413 @@
+import asyncio
+import os
+
+import pytest
+
+from core.orchestrator import Orchestrator, TaskFailureAction, _iter_completed
+
+
+def make_orchestrator(tmp_path, config=None, **kwargs):
+    project_path = tmp_path / "projects" / "demo"
+    project_path.mkdir(parents=True)
+    config = {"playwright": {"enabled": False}, **(config or {})}
+    return Orchestrator(str(project_path), config, **kwargs)
+
+
+def write_todo(orchestrator, text):
+    with open(orchestrator._todo_path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def read_todo(orchestrator):
+    with open(orchestrator._todo_path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def test_todo_edits_are_flushed(tmp_path):
+    orchestrator = make_orchestrator(tmp_path)
+    write_todo(orchestrator, "# TODO\n## Setup\n- [ ] a\n- [ ] b\n")
+
+    async def run():
+        await orchestrator._mark_task_complete("a")
+        await orchestrator._modify_task_in_todo("b", "b2")
+        await orchestrator._todo_flush_task
+
+    asyncio.run(run())
+    assert read_todo(orchestrator) == "# TODO\n## Setup\n- [x] a\n- [ ] b2\n"
+
+
+def test_todo_flush_keeps_external_edits(tmp_path):
+    orchestrator = make_orchestrator(tmp_path)
+    write_todo(orchestrator, "# TODO\n## Setup\n- [ ] a\n- [ ] b\n")
+
+    async def run():
+        await orchestrator._mark_task_complete("a")
+        # An agent appends a task while our edit is still unflushed
+        with open(orchestrator._todo_path, "a", encoding="utf-8") as f:
+            f.write("- [ ] added by agent\n")
+        await orchestrator._remove_task_from_todo("b")
+        await orchestrator.flush_todo()
+
+    asyncio.run(run())
+    assert read_todo(orchestrator) == "# TODO\n## Setup\n- [x] a\n- [ ] added by agent\n"
+    assert [t["text"] for t in orchestrator._parse_todo_tasks()] == ["a", "added by agent"]
+
+
+def test_error_logged_during_flush_is_written(tmp_path):
+    orchestrator = make_orchestrator(tmp_path)
+
+    async def run():
+        await orchestrator._log_error("first", "task", "details")
+        flush = asyncio.create_task(orchestrator.flush_logs())
+        await asyncio.sleep(0)  # flush_logs now holds the lock and is writing
+        await orchestrator._log_error("second", "task", "details")
+        await flush
+        if orchestrator._error_log_flush_task:
+            orchestrator._error_log_flush_task.cancel()
+
+    asyncio.run(run())
+    with open(orchestrator._error_log_path, "r", encoding="utf-8") as f:
+        log = f.read()
+    assert "## Error: first" in log
+    assert "## Error: second" in log
+
+
+@pytest.mark.skipif(not hasattr(asyncio, "eager_task_factory"), reason="needs Python 3.12+")
+def test_messages_are_batched_under_eager_task_factory(tmp_path):
+    frames = []
+
+    async def message_callback(frame):
+        frames.append(frame)
+
+    orchestrator = make_orchestrator(tmp_path, message_callback=message_callback)
+
+    async def run():
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+        for i in range(5):
+            orchestrator._send_message("info", f"message {i}")
+        await orchestrator._msg_consumer_task
+
+    asyncio.run(run())
+    assert [frame["type"] for frame in frames] == ["batch"]
+    assert len(frames[0]["messages"]) == 5
+
+
+def test_messages_queued_together_are_sent_as_one_batch(tmp_path):
+    frames = []
+
+    async def message_callback(frame):
+        frames.append(frame)
+
+    orchestrator = make_orchestrator(tmp_path, message_callback=message_callback)
+
+    async def run():
+        orchestrator._send_message("info", "one")
+        orchestrator._send_message("work_started", "two")
+        await orchestrator._msg_consumer_task
+
+    asyncio.run(run())
+    assert len(frames) == 1
+    assert frames[0]["type"] == "batch"
+    assert [m["message"] for m in frames[0]["messages"]] == ["one", "two"]
+
+
+def test_full_message_queue_keeps_critical_messages(tmp_path):
+    frames = []
+
+    async def message_callback(frame):
+        frames.append(frame)
+
+    orchestrator = make_orchestrator(tmp_path, message_callback=message_callback)
+    size = orchestrator._MSG_QUEUE_SIZE
+
+    async def run():
+        orchestrator._send_message("user_escalation", "decide", task="t")
+        for i in range(size * 2):
+            orchestrator._send_message("info", f"chatter {i}")
+        orchestrator._send_message("work_stopped", "stopped")
+        await orchestrator._msg_consumer_task
+
+    asyncio.run(run())
+    messages = [m for frame in frames for m in frame.get("messages", [frame])]
+    types = [m["type"] for m in messages]
+    assert types[0] == "user_escalation"
+    assert types[-1] == "work_stopped"
+    assert len(messages) <= size + 1
+    # The newest chatter survives; the oldest was evicted
+    assert messages[-2]["message"] == f"chatter {size * 2 - 1}"
+
+
+def test_iter_completed_yields_in_completion_order():
+    async def sleeper(delay, value):
+        await asyncio.sleep(delay)
+        return value
+
+    async def run():
+        tasks = [asyncio.create_task(sleeper(d, v)) for d, v in ((0.03, "slow"), (0.0, "fast"), (0.01, "mid"))]
+        return [task.result() async for task in _iter_completed(tasks)]
+
+    assert asyncio.run(run()) == ["fast", "mid", "slow"]
+
+
+def test_sibling_results_are_recorded_while_escalation_waits(tmp_path):
+    orchestrator = make_orchestrator(tmp_path, config={
+        "execution": {"max_concurrent_agents": 2, "enable_task_batching": False},
+        "quality_gates": {"run_tests": False, "run_security_review": False, "run_qa_review": False},
+    })
+    write_todo(orchestrator, "# TODO\n## Setup\n- [ ] fails fast\n- [ ] splits later\n")
+    seen_at_escalation = []
+
+    async def execute_task(task, context=None):
+        if task["text"] == "fails fast":
+            return {"task": task, "result": {"status": "error", "result": "bad"}}
+        await asyncio.sleep(0.05)
+        await orchestrator._mark_task_complete(task["text"])
+        return {"task": task, "result": {"status": "split"}}
+
+    async def escalate_to_user(task, error, agent):
+        # The user takes a while; the sibling's result must not wait on them
+        await asyncio.sleep(0.2)
+        seen_at_escalation.extend(a["action"] for a in orchestrator.get_activity_log(100))
+        return TaskFailureAction.REMOVE_TASK
+
+    async def qa_review(has_changes=None):
+        return {"status": "skipped"}
+
+    orchestrator._execute_task = execute_task
+    orchestrator._escalate_to_user = escalate_to_user
+    orchestrator._run_qa_review = qa_review
+
+    asyncio.run(orchestrator.start_work())
+    assert "Task split" in seen_at_escalation
+    assert read_todo(orchestrator) == "# TODO\n## Setup\n- [x] splits later\n"
+
+
+def test_parse_review_issues_dedupes_and_caps(tmp_path):
+    orchestrator = make_orchestrator(tmp_path)
+    review = "\n".join([
+        "Findings:",
+        "- SEVERITY: MAJOR",
+        "- TITLE: Missing rate limit",
+        "- DESCRIPTION: login can be brute forced",
+        "1. BLOCKING: SQL injection",
+        "- DESCRIPTION: user input in query",
+        "2. BLOCKING: SQL injection",
+        "- DESCRIPTION: duplicate report",
+    ])
+    issues = orchestrator._parse_review_issues(review)
+    # Repeated titles keep the first report
+    assert issues == [
+        {"title": "[MAJOR] Missing rate limit", "description": "login can be brute forced", "severity": "MAJOR"},
+        {"title": "[BLOCKING] SQL injection", "description": "user input in query"},
+    ]
+
+    many = "\n".join(f"BLOCKING: issue {i}" for i in range(orchestrator._MAX_REVIEW_ISSUES * 2))
+    assert len(orchestrator._parse_review_issues(many)) == orchestrator._MAX_REVIEW_ISSUES
+
+
+def test_set_max_concurrent_resizes_run_slots(tmp_path):
+    orchestrator = make_orchestrator(tmp_path, config={"execution": {"max_concurrent_agents": 1}})
+
+    async def hold(entered, release):
+        async with orchestrator._run_slot():
+            entered.set()
+            await release.wait()
+
+    async def run():
+        events = [(asyncio.Event(), asyncio.Event()) for _ in range(3)]
+        first = asyncio.create_task(hold(*events[0]))
+        second = asyncio.create_task(hold(*events[1]))
+        await asyncio.sleep(0.01)
+        assert events[0][0].is_set() and not events[1][0].is_set()
+
+        # Raising the limit admits the waiting run while the first still holds its slot
+        await orchestrator.set_max_concurrent(2)
+        await asyncio.sleep(0.01)
+        assert events[1][0].is_set()
+
+        # Lowering it admits nothing new until in-flight runs drop below the limit
+        await orchestrator.set_max_concurrent(1)
+        third = asyncio.create_task(hold(*events[2]))
+        events[0][1].set()
+        await first
+        await asyncio.sleep(0.01)
+        assert not events[2][0].is_set()
+        events[1][1].set()
+        await second
+        await asyncio.sleep(0.01)
+        assert events[2][0].is_set()
+        events[2][1].set()
+        await third
+
+    asyncio.run(run())
+
+
+def test_error_log_entries_survive_a_failed_write(tmp_path):
+    orchestrator = make_orchestrator(tmp_path)
+    log_path = orchestrator._error_log_path
+    # A path under a missing directory makes the write fail
+    orchestrator._error_log_path = str(tmp_path / "missing" / "error_log.md")
+
+    async def run():
+        await orchestrator._log_error("first", "task", "details")
+        await orchestrator.flush_logs()
+        orchestrator._error_log_path = log_path
+        await orchestrator._log_error("second", "task", "details")
+        await orchestrator.flush_logs()
+        if orchestrator._error_log_flush_task:
+            orchestrator._error_log_flush_task.cancel()
+
+    asyncio.run(run())
+    with open(log_path, "r", encoding="utf-8") as f:
+        log = f.read()
+    assert log.index("## Error: first") < log.index("## Error: second")
+
+
+def test_retry_backoff_releases_the_run_slot(tmp_path):
+    orchestrator = make_orchestrator(tmp_path, {"execution": {"max_concurrent_agents": 1}})
+    orchestrator._retry_delay = lambda attempt: 0.05
+    orchestrator.memory.record_action = lambda *args: None
+    events = []
+
+    async def flaky(**kwargs):
+        events.append("engineer run")
+        if events.count("engineer run") == 1:
+            raise RuntimeError("overloaded")
+        return {"status": "complete", "result": "ok"}
+
+    async def steady(**kwargs):
+        events.append("dba run")
+        return {"status": "complete", "result": "ok"}
+
+    orchestrator.agents["software_engineer"].process_task = flaky
+    orchestrator.agents["database_admin"].process_task = steady
+
+    async def run():
+        engineer = asyncio.create_task(orchestrator.assign_task("software_engineer", "task"))
+        await asyncio.sleep(0.01)  # the engineer's first attempt failed; it is backing off
+        await orchestrator.assign_task("database_admin", "task")
+        return await engineer
+
+    assert asyncio.run(run())["status"] == "complete"
+    # The other agent got the only slot during the backoff
+    assert events == ["engineer run", "dba run", "engineer run"]
+
+
+def test_per_model_concurrency_limits_runs(tmp_path):
+    orchestrator = make_orchestrator(tmp_path, {
+        "execution": {"max_concurrent_agents": 4, "per_model_concurrency": {"opus": 1}},
+    })
+    running = {"total": 0}
+    peak = {"total": 0}
+
+    def fake_process_task(agent):
+        async def process_task(**kwargs):
+            model = agent.model_preference
+            for key in (model, "total"):
+                running[key] = running.get(key, 0) + 1
+                peak[key] = max(peak.get(key, 0), running[key])
+            await asyncio.sleep(0.01)
+            running[model] -= 1
+            running["total"] -= 1
+            return {"status": "complete", "result": "ok"}
+        return process_task
+
+    for agent in orchestrator.agents.values():
+        agent.process_task = fake_process_task(agent)
+    orchestrator.memory.record_action = lambda *args: None
+
+    async def run():
+        await asyncio.gather(*(
+            orchestrator.assign_task(name, "task")
+            for name in ("project_manager", "security_reviewer", "database_admin",
+                         "software_engineer", "ui_ux_engineer", "testing_agent", "qa_tester")
+        ))
+
+    asyncio.run(run())
+    # Opus runs one at a time; auto agents fill the remaining shared slots
+    assert peak["opus"] == 1
+    assert peak["auto"] == 3
+    assert peak["total"] == 4
+
+
+def test_bare_section_header_clears_the_section(tmp_path):
+    orchestrator = make_orchestrator(tmp_path)
+    write_todo(orchestrator, "# TODO\n## Setup\n- [ ] a\n## \n- [ ] b\n##\n- [ ] c\n")
+
+    async def run():
+        await orchestrator._refresh_todo_schedule()
+        return orchestrator._parse_todo_tasks()
+
+    tasks = asyncio.run(run())
+    assert [(t["text"], t["section"]) for t in tasks] == [("a", "Setup"), ("b", ""), ("c", "")]
+
+
+def test_todo_schedule_orders_ready_tasks(tmp_path):
+    orchestrator = make_orchestrator(tmp_path, {"execution": {"max_concurrent_agents": 3}})
+    write_todo(orchestrator, (
+        "# TODO\n"
+        "## Fresh\n- [ ] {1} f1\n- [ ] f2\n"
+        "## Started\n- [x] {2} s1\n- [ ] s2 [depends: 2]\n- [ ] s3 [depends: 3]\n- [ ] {3} s4\n"
+    ))
+
+    async def run():
+        await orchestrator._refresh_todo_schedule()
+        ready, progress = orchestrator._todo_schedule()
+        return ready, progress, orchestrator._get_parallel_tasks(), orchestrator._get_parallel_tasks(exclude={"s2 [depends: 2]"})
+
+    ready, progress, batch, batch_without_s2 = asyncio.run(run())
+    # Ready tasks keep TODO order; a task waiting on an open dependency is held back
+    assert [t["display_text"] for t in ready] == ["f1", "f2", "s2", "s4"]
+    assert progress == {"Fresh": 0.0, "Started": 0.25}
+    # The section closest to completion fills the batch first
+    assert [t["display_text"] for t in batch] == ["s2", "s4", "f1"]
+    assert [t["display_text"] for t in batch_without_s2] == ["s4", "f1", "f2"]
+
+
+def test_detect_pytests_reuses_the_walk_until_code_changes(tmp_path):
+    orchestrator = make_orchestrator(tmp_path)
+    project = tmp_path / "projects" / "demo"
+    (project / "requirements.txt").write_text("")
+    (project / "app.py").write_text("")
+    walks = []
+    walk_code_paths = orchestrator._walk_code_paths
+
+    def counting_walk():
+        walks.append(1)
+        return walk_code_paths()
+
+    orchestrator._walk_code_paths = counting_walk
+
+    latest_mtime = orchestrator._get_latest_code_mtime()
+    walks.clear()
+    assert not orchestrator._detect_pytests(latest_mtime)
+    assert not orchestrator._detect_pytests(latest_mtime)
+    assert len(walks) == 1
+
+    # Tests kept under QA/ count, though that folder is outside the code walk
+    (project / "QA").mkdir()
+    (project / "QA" / "test_smoke.py").write_text("")
+    assert orchestrator._detect_pytests(latest_mtime)
+    assert len(walks) == 1
+
+    (project / "QA" / "test_smoke.py").unlink()
+    (project / "tests").mkdir()
+    (project / "tests" / "test_app.py").write_text("")
+    latest_mtime = orchestrator._get_latest_code_mtime()
+    walks.clear()
+    assert orchestrator._detect_pytests(latest_mtime)
+    assert len(walks) == 1
+
+
+def test_quality_marker_records_the_reviewed_mtime(tmp_path):
+    orchestrator = make_orchestrator(tmp_path)
+    app = tmp_path / "projects" / "demo" / "app.py"
+    app.write_text("v1")
+    reviewed_mtime = orchestrator._get_latest_code_mtime()
+    # Edited while the review was running
+    os.utime(app, (reviewed_mtime + 5, reviewed_mtime + 5))
+
+    orchestrator._save_quality_marker(reviewed_mtime)
+    assert orchestrator._has_code_changes_since_last_review()
+    orchestrator._save_quality_marker()
+    assert not orchestrator._has_code_changes_since_last_review()
@@ -0,0 +1,48 @@
+import json
+
+from core import playwright_utils
+from core.playwright_utils import PlaywrightManager
+
+
+def make_manager(monkeypatch, probes, **playwright_config):
+    manager = PlaywrightManager({"playwright": playwright_config})
+
+    def run_detection_checks():
+        probes.append(1)
+        return True
+
+    monkeypatch.setattr(manager, "_run_detection_checks", run_detection_checks)
+    return manager
+
+
+def test_detection_result_is_shared_until_the_ttl_expires(tmp_path, monkeypatch):
+    cache_path = tmp_path / "playwright_detect.json"
+    monkeypatch.setattr(playwright_utils, "DETECT_CACHE_PATH", cache_path)
+    probes = []
+
+    assert make_manager(monkeypatch, probes).is_available()
+    # A new manager (or process) reuses the stored result
+    assert make_manager(monkeypatch, probes).is_available()
+    assert len(probes) == 1
+
+    # A result from a different context is not reused
+    assert make_manager(monkeypatch, probes, npm_list_fallback=True).is_available()
+    assert len(probes) == 2
+
+    # Nor is an expired one
+    cached = json.loads(cache_path.read_text())
+    cached["ts"] -= playwright_utils.DEFAULT_DETECT_CACHE_TTL_SECONDS + 1
+    cache_path.write_text(json.dumps(cached))
+    assert make_manager(monkeypatch, probes, npm_list_fallback=True).is_available()
+    assert len(probes) == 3
+
+
+def test_zero_ttl_disables_the_detection_cache(tmp_path, monkeypatch):
+    cache_path = tmp_path / "playwright_detect.json"
+    monkeypatch.setattr(playwright_utils, "DETECT_CACHE_PATH", cache_path)
+    probes = []
+
+    for _ in range(2):
+        assert make_manager(monkeypatch, probes, detect_cache_ttl_seconds=0).is_available()
+    assert len(probes) == 2
+    assert not cache_path.exists()
@@ -0,0 +1,28 @@
+"""Cheap wall-clock timestamps for activity feeds and UI messages."""
+
+from __future__ import annotations
+
+import time
+from datetime import datetime
+from typing import Tuple
+
+# (whole second, formatted string) of the last timestamp formatted by fmt_ts
+_ts_cache: Tuple[int, str] = (-1, "")
+
+
+def fmt_ts(ns: int) -> str:
+    """Format a time.time_ns() timestamp as a local ISO-8601 string.
+
+    The UI only shows wall-clock seconds, so the string is produced at
+    second resolution and reused for every entry within the same second.
+    """
+    global _ts_cache
+    sec = ns // 1_000_000_000
+    if sec != _ts_cache[0]:
+        _ts_cache = (sec, datetime.fromtimestamp(sec).isoformat(timespec='seconds'))
+    return _ts_cache[1]
+
+
+def now_iso() -> str:
+    """Current local time as an ISO-8601 string (see fmt_ts)."""
+    return fmt_ts(time.time_ns())
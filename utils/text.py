@@ -0,0 +1,53 @@
+"""Helpers for keeping CLI output and error text ASCII-safe."""
+
+from __future__ import annotations
+
+from typing import Dict
+
+
+class _AsciiScrubTable(dict):
+    """str.translate table: ASCII maps to itself, any other code point to '?'.
+
+    Non-ASCII entries are added the first time they are seen, so the table
+    stays small while lookups remain C-level dict hits.
+    """
+
+    def __missing__(self, codepoint: int) -> str:
+        self[codepoint] = '?'
+        return '?'
+
+
+# Typographic characters agents commonly emit, with readable ASCII stand-ins
+_PUNCTUATION_REPLACEMENTS: Dict[str, str] = {
+    '\u2018': "'",   # Left single quote
+    '\u2019': "'",   # Right single quote
+    '\u201c': '"',   # Left double quote
+    '\u201d': '"',   # Right double quote
+    '\u2013': '-',   # En dash
+    '\u2014': '--',  # Em dash
+    '\u2026': '...', # Ellipsis
+    '\u00a0': ' ',   # Non-breaking space
+}
+
+_ASCII_SCRUB_TABLE = _AsciiScrubTable((i, i) for i in range(128))
+
+_SANITIZE_TABLE = _AsciiScrubTable((i, i) for i in range(128))
+_SANITIZE_TABLE.update((ord(char), repl) for char, repl in _PUNCTUATION_REPLACEMENTS.items())
+
+
+def to_ascii(text: str) -> str:
+    """Replace non-ASCII characters with '?' (same output as encode/decode with errors='replace')."""
+    if text.isascii():
+        return text
+    return text.translate(_ASCII_SCRUB_TABLE)
+
+
+def sanitize_output(text: str) -> str:
+    """Make agent output ASCII-safe in one pass.
+
+    Smart quotes, dashes, ellipses and non-breaking spaces become their
+    ASCII equivalents; any other non-ASCII character becomes '?'.
+    """
+    if not text or text.isascii():
+        return text
+    return text.translate(_SANITIZE_TABLE)
@@ -69,6 +69,13 @@ class AgenticTeamApp {
 
         // Handle different message types
         switch (data.type) {
+            case 'batch':
+                // Several orchestrator messages coalesced into one frame
+                for (const msg of data.messages || []) {
+                    this.handleWebSocketMessage({ project: data.project, ...msg });
+                }
+                break;
+
             case 'agent_message':
                 this.addChatMessage(data.agent, data.message, 'agent');
                 this.setWaitingForInput(true, data.agent);